@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Benchmark für den POI Sprite Builder
+Erzeugt synthetische Mappings und Font-Awesome-Bäume (100 bis 10.000
+Icons), misst die Build-Stufen mit einem lokalen spreet-Ersatz (offline,
+ohne Docker) und speichert die Ergebnisse als JSON zum Vergleich zwischen
+Commits.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import sprite_packer
+from build_poi_sprites import POISpriteBuilder, print_header, print_info, print_success
+from mapping_store import MappingStore
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Stilverteilung wie im Font-Awesome-Archiv (meist solid)
+STYLES = (("solid", 0.7), ("regular", 0.15), ("brands", 0.15))
+
+# Kommandozeilen-kompatibler spreet-Ersatz: packt die SVG-Größen per
+# Shelf-Packing und schreibt Index-JSON und ein leeres PNG passender Größe.
+SPREET_STANDIN = '''#!/usr/bin/env python3
+import json, re, struct, sys, zlib
+from pathlib import Path
+sys.path.insert(0, {repo!r})
+import sprite_packer
+
+args = sys.argv[1:]
+if args == ["--version"]:
+    print("spreet-standin 0.0.0")
+    sys.exit(0)
+ratio = 1.0
+if "--ratio" in args:
+    i = args.index("--ratio")
+    ratio = float(args[i + 1])
+    del args[i:i + 2]
+sdf = "--sdf" in args
+src, out = [a for a in args if not a.startswith("--")]
+
+sizes = {{}}
+for svg in Path(src).glob("*.svg"):
+    head = svg.read_bytes()[:300].decode("utf-8", "replace")
+    w = float(re.search(r'width="([\\d.]+)"', head).group(1))
+    h = float(re.search(r'height="([\\d.]+)"', head).group(1))
+    sizes[svg.stem] = (max(1, round(w * ratio)), max(1, round(h * ratio)))
+width, height, positions = sprite_packer.pack_shelf(sizes)
+
+index = {{}}
+for name, (x, y) in sorted(positions.items()):
+    index[name] = {{"height": sizes[name][1], "pixelRatio": ratio, "width": sizes[name][0],
+                   "x": x, "y": y}}
+    if sdf:
+        index[name]["sdf"] = True
+Path(out + ".json").write_text(json.dumps(index, indent=2))
+
+def chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+compressor = zlib.compressobj(6)
+row = b"\\0" + b"\\0" * (4 * max(width, 1))
+idat = b"".join(compressor.compress(row) for _ in range(max(height, 1))) + compressor.flush()
+with open(out + ".png", "wb") as f:
+    f.write(b"\\x89PNG\\r\\n\\x1a\\n")
+    f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", max(width, 1), max(height, 1), 8, 6, 0, 0, 0)))
+    f.write(chunk(b"IDAT", idat))
+    f.write(chunk(b"IEND", b""))
+'''
+
+
+def write_standin(path):
+    path = Path(path)
+    path.write_text(SPREET_STANDIN.format(repo=str(Path(__file__).resolve().parent)))
+    path.chmod(0o755)
+    return path
+
+
+def synthetic_svg(rng):
+    """SVG mit FA-typischer Geometrie (viewBox-Breite 320-640 bei Höhe 512)"""
+    width = rng.choice((320, 384, 448, 512, 576, 640))
+    points = " ".join(f"L{rng.uniform(0, width):.2f} {rng.uniform(0, 512):.2f}"
+                      for _ in range(rng.randint(4, 40)))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} 512" '
+            f'width="{width * 24 / 512:.2f}" height="24">'
+            f'<!--! synthetic --><path d="M0 0 {points} Z"/></svg>')
+
+
+def generate_fontawesome(fa_dir, count, rng, duplicate_rate=0.05):
+    """Synthetischer entpackter FA-Baum mit ``count`` Icons"""
+    root = Path(fa_dir) / "fontawesome-free-0.0.0-web" / "svgs"
+    names = []
+    previous = None
+    for i in range(count):
+        style = rng.choices([s for s, _ in STYLES], weights=[w for _, w in STYLES])[0]
+        (root / style).mkdir(parents=True, exist_ok=True)
+        name = f"icon-{i:05d}"
+        content = previous if previous and rng.random() < duplicate_rate else synthetic_svg(rng)
+        (root / style / f"{name}.svg").write_text(content)
+        previous = content
+        names.append(name)
+    return names
+
+
+def generate_mapping(icon_names, count, rng, missing_rate=0.01):
+    """POI-Typ → Icon, mehrere Typen teilen sich Icons, einige Icons fehlen"""
+    mapping = {}
+    for i in range(count):
+        icon = rng.choice(icon_names)
+        if rng.random() < missing_rate:
+            icon = f"missing-{i}"
+        mapping[f"poi_{i:05d}"] = icon
+    return mapping
+
+
+def quiet_run(builder):
+    """Builder-Lauf ohne Konsolenausgabe, liefert den Profil-Bericht"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            builder.run()
+        except SystemExit:
+            pass
+    return builder.profiler.report()
+
+
+def time_packers(count, rng, repeat=3):
+    """Reine Packing-Zeit je Verfahren für ``count`` Icons (ohne Rendering)"""
+    sizes = {f"i{i}": (round(rng.choice((320, 384, 448, 512, 576, 640)) * 24 / 512), 24)
+             for i in range(count)}
+    results = {}
+    for name, pack in sprite_packer.PACKERS.items():
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            width, height, _ = pack(sizes)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {
+            "seconds": round(best, 6),
+            "fill": round(sprite_packer.fill_ratio(sizes, width, height), 4),
+        }
+    return results
+
+
+def bench_size(work_dir, count, seed, ratios, spreet_bin):
+    """Kalt-, Warm- und Teil-Rebuild für eine Icon-Anzahl"""
+    rng = random.Random(seed)
+    case_dir = Path(work_dir) / f"n{count}"
+    shutil.rmtree(case_dir, ignore_errors=True)
+    fa_dir = case_dir / "fontawesome"
+
+    start = time.perf_counter()
+    icon_names = generate_fontawesome(fa_dir, count, rng)
+    mapping = generate_mapping(icon_names, count, rng)
+    store = MappingStore(case_dir / "build" / "poi_mapping.json")
+    store.save(mapping)
+    generate_seconds = time.perf_counter() - start
+
+    def builder():
+        return POISpriteBuilder(
+            build_dir=case_dir / "build",
+            output_dir=case_dir / "output",
+            sprite_name="bench",
+            pixel_ratios=ratios,
+            spreet_bin=str(spreet_bin),
+            fa_dir=fa_dir,
+            offline=True,
+        )
+
+    runs = {"cold": quiet_run(builder()), "warm": quiet_run(builder())}
+
+    # 1 % der Zuordnungen ändern → Teil-Rebuild
+    changed = {poi_type: rng.choice(icon_names)
+               for poi_type in rng.sample(sorted(mapping), max(1, count // 100))}
+    store.record(changed)
+    runs["partial"] = quiet_run(builder())
+
+    return {
+        "icons": count,
+        "generate_seconds": round(generate_seconds, 6),
+        "runs": runs,
+        "packers": time_packers(count, rng),
+    }
+
+
+def git_revision():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+def compare(previous, current):
+    """Gegenüberstellung der Stufenzeiten zweier Ergebnisdateien"""
+    print_header(f"Vergleich {previous.get('revision')} → {current.get('revision')}")
+    old_cases = {case["icons"]: case for case in previous.get("cases", [])}
+    for case in current["cases"]:
+        old = old_cases.get(case["icons"])
+        if old is None:
+            continue
+        for run_name, report in case["runs"].items():
+            old_stages = old["runs"].get(run_name, {}).get("stages", {})
+            for stage, seconds in sorted(report["stages"].items()):
+                if stage not in old_stages or not old_stages[stage]:
+                    continue
+                change = (seconds - old_stages[stage]) / old_stages[stage]
+                print(f"  {case['icons']:>6} {run_name:8} {stage:24} "
+                      f"{old_stages[stage] * 1000:9.1f} → {seconds * 1000:9.1f} ms ({change:+.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sprite builder on synthetic icon sets.")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="Kommagetrennte Icon-Anzahlen")
+    parser.add_argument("--ratios", default="1,2", help="Pixel-Ratios der Sprite-Varianten")
+    parser.add_argument("--work-dir", default=os.getenv("BENCH_DIR", "/tmp/poi-sprite-bench"))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default=None,
+                        help="Ergebnis-JSON (Standard: <work-dir>/bench-<revision>.json)")
+    parser.add_argument("--compare", default=None, help="Frühere Ergebnisdatei zum Vergleich")
+    parser.add_argument("--keep", action="store_true", help="Synthetische Bäume nicht löschen")
+    args = parser.parse_args()
+
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    spreet_bin = write_standin(work_dir / "spreet-standin")
+    ratios = [float(r) if "." in r else int(r) for r in args.ratios.split(",") if r.strip()]
+
+    results = {
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "ratios": ratios,
+        "cases": [],
+    }
+
+    for count in (int(n) for n in args.sizes.split(",") if n.strip()):
+        print_header(f"{count} Icons")
+        case = bench_size(work_dir, count, args.seed, ratios, spreet_bin)
+        results["cases"].append(case)
+        for run_name, report in case["runs"].items():
+            stages = ", ".join(f"{stage} {seconds * 1000:.0f} ms"
+                               for stage, seconds in sorted(report["stages"].items(),
+                                                            key=lambda item: -item[1])[:4])
+            print_info(f"{run_name:8} {report['total_seconds'] * 1000:9.1f} ms  ({stages})")
+        packers = ", ".join(f"{name} {entry['seconds'] * 1000:.0f} ms/{entry['fill']:.0%}"
+                            for name, entry in case["packers"].items())
+        print_info(f"Packing: {packers}")
+        if not args.keep:
+            shutil.rmtree(work_dir / f"n{count}", ignore_errors=True)
+
+    output = Path(args.output) if args.output else work_dir / f"bench-{results['revision'] or 'local'}.json"
+    output.write_text(json.dumps(results, indent=2))
+    print_success(f"Ergebnisse gespeichert: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
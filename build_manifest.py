@@ -0,0 +1,74 @@
+"""Build-Manifest für inkrementelle Sprite-Builds.
+
+Speichert pro Build-Stufe einen Inhalts-Hash (Mapping, Quell-SVGs,
+spreet-Image, Sprite-Einstellungen) im Build-Verzeichnis, damit
+unveränderte Stufen beim nächsten Lauf übersprungen werden können.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+
+def hash_bytes(data):
+    """SHA-256 Hexdigest für Bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 16):
+    """SHA-256 Hexdigest für eine Datei"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_json(value):
+    """Stabiler Hash für JSON-serialisierbare Werte"""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hash_bytes(data.encode('utf-8'))
+
+
+class BuildManifest:
+    """Persistiert Stufen-Schlüssel in ``build_manifest.json``"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.stages = {}
+
+    def load(self):
+        if not self.path.exists():
+            return self
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("version") == MANIFEST_VERSION:
+            self.stages = data.get("stages", {})
+        return self
+
+    def save(self):
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": MANIFEST_VERSION, "stages": self.stages}, f, indent=2, sort_keys=True)
+        tmp_path.replace(self.path)
+
+    def is_fresh(self, stage, key):
+        """True wenn die Stufe zuletzt mit genau diesem Schlüssel gebaut wurde"""
+        entry = self.stages.get(stage)
+        return bool(entry) and entry.get("key") == key
+
+    def record(self, stage, key, **details):
+        self.stages[stage] = {"key": key, **details}
+        self.save()
+
+    def invalidate(self, stage=None):
+        if stage is None:
+            self.stages = {}
+        else:
+            self.stages.pop(stage, None)
+        self.save()
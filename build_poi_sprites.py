@@ -8,13 +8,36 @@ import argparse
 import json
 import os
 import sys
+import struct
 import subprocess
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-import urllib.request
-import zipfile
 
-from poi_mapping import ALL_POI_TYPES
+from build_manifest import BuildManifest, hash_file, hash_json
+from build_profile import BuildProfiler
+from hashed_output import is_artifact, publish_hashed
+from icon_index import IconIndex, ZipIconIndex, find_svgs_roots
+import fontawesome
+from mapping_store import MappingStore, diff_mappings
+from png_optimizer import OPTIMIZE_MODES, optimize_png
+from raster_cache import DEFAULT_MAX_BYTES, RasterCache
+from poi_histogram import load_histogram
+from poi_registry import REGISTRY
+import release_publisher
+import sprite_packer
+from spreet_worker import SpreetWorker, SpreetWorkerError
+from style_icons import load_style, reachable_icons
+from svg_normalize import NormalizeCache
+from svg_staging import STAGING_MODES, remove_stale, stage_bytes, stage_file
+
+BACKENDS = ("docker", "native")
+# Bin-Packing des nativen Backends ("auto": kleinste Sheet-Fläche)
+PACKERS = ("auto",) + tuple(sprite_packer.PACKERS)
+
+# Ergebnisse von check_docker/build_docker_image für die laufende Sitzung
+_DOCKER_CHECKS = {}
+ICON_SOURCES = ("extracted", "zip")
 
 # Farben für Terminal-Output
 class Colors:
@@ -41,27 +64,152 @@ def print_warning(text):
 def print_info(text):
     print(f"{Colors.OKCYAN}ℹ{Colors.ENDC} {text}")
 
+def parse_ratio(value):
+    """'2' → 2, '1.5' → 1.5"""
+    ratio = float(value)
+    return int(ratio) if ratio.is_integer() else ratio
+
+def check_ratios(backend, pixel_ratios):
+    """spreet kennt nur ganzzahlige Ratios, gebrochene nur im nativen Backend"""
+    fractional = [ratio for ratio in pixel_ratios if not float(ratio).is_integer()]
+    if fractional and backend != "native":
+        ratios = ", ".join(f"{ratio:g}" for ratio in fractional)
+        raise ValueError(f"Pixel-Ratio {ratios} nur mit --backend native möglich (spreet: nur ganzzahlig)")
+
 class POISpriteBuilder:
     def __init__(self, 
                  build_dir="/srv/build/poi-sprites",
                  output_dir="/srv/assets/sprites/poi",
                  docker_image="local-spreet-builder",
-                 sprite_name="poi"):
+                 sprite_name="poi",
+                 force=False,
+                 backend="docker",
+                 pixel_ratios=(1, 2),
+                 jobs=None,
+                 staging_mode="auto",
+                 unique=True,
+                 sdf=False,
+                 packer="auto",
+                 style_file=None,
+                 histogram_file=None,
+                 min_count=0,
+                 shard=False,
+                 raster_cache=True,
+                 raster_cache_dir=None,
+                 raster_cache_bytes=DEFAULT_MAX_BYTES,
+                 normalize_svgs=False,
+                 icon_size=24,
+                 icon_padding=2,
+                 png_optimize="off",
+                 hashed_output=False,
+                 atomic_publish=False,
+                 keep_releases=3,
+                 profile=False,
+                 fa_version=fontawesome.FA_VERSION,
+                 fa_cache_dir=fontawesome.DEFAULT_CACHE_DIR,
+                 fa_zip=None,
+                 fa_sha256=None,
+                 offline=False,
+                 icon_source="extracted",
+                 warm_worker=False,
+                 keep_worker=False,
+                 spreet_bin=None,
+                 fa_dir=None,
+                 mapping_file=None):
         
         self.build_dir = Path(build_dir)
         self.output_dir = Path(output_dir)
+        # Ziel der Schreib-Stufen (Staging-Dir bei atomarem Publish)
+        self.target_dir = self.output_dir
         self.docker_image = docker_image
         self.sprite_name = sprite_name
+        self.force = force
+        self.backend = backend
+        check_ratios(backend, pixel_ratios)
+        self.pixel_ratios = sorted(set(pixel_ratios))
+        self.jobs = jobs or os.cpu_count() or 1
+        self.staging_mode = staging_mode
+        self.unique = unique
+        self.packer = packer
+        # Nur Icons packen, die der Style erreichen kann
+        self.style_file = Path(style_file) if style_file else None
+        self.style_report = None
+        # Seltene Klassen weglassen (Häufigkeit aus poi_histogram.py)
+        self.histogram_file = Path(histogram_file) if histogram_file else None
+        self.min_count = min_count
+        self.pruned = None
+        # Ein Sheet je Kategorie (MapLibre Multi-Sprite) statt eines großen
+        self.shard = shard
+        self.shard_members = {}
+        self.shard_manifests = {}
+        # Gerasterte Icons über Läufe und Sprite-Sets hinweg (nur nativ)
+        self.raster_cache = raster_cache
+        self.raster_cache_bytes = raster_cache_bytes
+        self.raster_stats = None
+        self.packers_used = {}
+        # Quadratische viewBox, Rand und gekürzte Pfade vor dem Packen
+        self.normalize_svgs = normalize_svgs
+        self.icon_size = icon_size
+        self.icon_padding = icon_padding
+        # Signed Distance Field: ein einfärbbares Sheet statt je Farbe eines
+        self.sdf = sdf
+        self.png_optimize = png_optimize
+        self.png_stats = {}
+        self.hashed_output = hashed_output
+        self.hashed_manifest = None
+        self.atomic_publish = atomic_publish
+        self.keep_releases = keep_releases
+        
+        # Stufen-Timer und Zähler, Bericht nur mit profile=True
+        self.profile = profile
+        self.profiler = BuildProfiler(labels={"sprite": sprite_name})
         
         # Unterverzeichnisse im Build-Dir
         self.svg_dir = self.build_dir / "svgs"
         self.tmp_dir = self.build_dir / "tmp"
-        self.fa_dir = self.build_dir / "fontawesome"
-        self.mapping_file = self.build_dir / "poi_mapping.json"
+        self.normalized_dir = self.build_dir / "normalized"
+        self.subset_dir = self.build_dir / "subset"
+        self.shard_dir = self.build_dir / "shards"
+        self.raster_cache_dir = Path(raster_cache_dir) if raster_cache_dir else self.build_dir / "raster_cache"
+        self.fa_dir = Path(fa_dir) if fa_dir else self.build_dir / "fontawesome"
+        self.mapping_file = Path(mapping_file) if mapping_file else self.build_dir / "poi_mapping.json"
+        self.mapping_store = MappingStore(self.mapping_file)
+        
+        # Font Awesome Quelle
+        self.fa_version = fa_version
+        self.fa_cache_dir = Path(fa_cache_dir)
+        self.fa_zip = Path(fa_zip) if fa_zip else None
+        self.fa_sha256 = fa_sha256
+        self.offline = offline
+        # "extracted": entpackter Baum, "zip": direkt aus dem Archiv lesen
+        self.icon_source = icon_source
+        self.fa_archive = None
+        
+        # spreet-Ausführung: warmer Container oder lokales Binary
+        self.warm_worker = warm_worker
+        self.keep_worker = keep_worker
+        self.spreet_bin = spreet_bin
+        self.worker = None
+        # Geteilte Ressourcen bei Batch-Builds (siehe build_sprite_sets.py)
+        self.owns_worker = True
+        self.executor = None
         
         # Mapping speichern
         self.mapping = {}
         
+        # Manifest für inkrementelle Builds
+        self.manifest = BuildManifest(self.build_dir / "build_manifest.json")
+        
+        # Seit dem letzten Build geänderte POI-Typen (None: vollständiger Lauf)
+        self.changed_types = None
+        
+        # Icon-Name → SVG-Pfad, wird bei Bedarf geladen
+        self.icon_index = None
+
+        # False, wenn die Mapping-Schlüssel keine POI-Typen der Registry sind
+        # (z.B. flache Icon-Sets in build_sprite_sets.py)
+        self.registry_mapping = True
+        
     def setup_directories(self):
         """Erstelle Arbeitsverzeichnisse"""
         print_header("Setup Verzeichnisse")
@@ -72,9 +220,13 @@ class POISpriteBuilder:
     
     def load_existing_mapping(self, required=True):
         """Lade existierendes Mapping"""
-        if self.mapping_file.exists():
-            with open(self.mapping_file, 'r') as f:
-                self.mapping = json.load(f)
+        if self.mapping:
+            print_success(f"Mapping vorgegeben: {len(self.mapping)} Einträge")
+            return True
+        
+        if self.mapping_store.exists():
+            # Inklusive nicht kompaktierter Journal-Einträge eines laufenden Mappers
+            self.mapping = self.mapping_store.load()
             print_success(f"Existierendes Mapping geladen: {len(self.mapping)} Einträge")
             return True
 
@@ -85,102 +237,409 @@ class POISpriteBuilder:
         print_info("Kein existierendes Mapping gefunden, starte neu")
         return True
     
+    def obtain_fontawesome_archive(self):
+        """Pfad eines verifizierten Archivs (lokal oder aus dem Cache)"""
+        if self.fa_zip:
+            print_info(f"Verwende lokales Archiv: {self.fa_zip}")
+            fontawesome.verify(self.fa_zip, self.fa_sha256)
+            return self.fa_zip
+        cached = fontawesome.cached_archive(self.fa_cache_dir, self.fa_version)
+        if not cached.exists() and not self.offline:
+            print_info(f"Lade Font Awesome Free {self.fa_version} von GitHub...")
+        return fontawesome.fetch_archive(self.fa_version, self.fa_cache_dir,
+                                         self.fa_sha256, offline=self.offline)
+    
     def download_fontawesome(self):
-        """Lade Font Awesome Free herunter"""
+        """Lade Font Awesome Free herunter (Cache, Prüfsumme, nur svgs/)"""
         print_header("Font Awesome Download")
         
-        fa_zip = self.build_dir / "fontawesome.zip"
+        if self.icon_index is not None:
+            print_info("Icon-Quelle bereits geladen, überspringe Download")
+            return True
         
-        if (self.fa_dir / "svgs").exists():
+        # Das Archiv entpackt nach fontawesome-free-<version>-web/svgs
+        if (self.icon_source == "extracted" and find_svgs_roots(self.fa_dir)
+                and not self.fa_zip):
             print_info("Font Awesome bereits heruntergeladen, überspringe Download")
-            return
-        
-        print_info("Lade Font Awesome Free von GitHub...")
-        url = "https://github.com/FortAwesome/Font-Awesome/releases/download/6.5.1/fontawesome-free-6.5.1-web.zip"
+            return True
         
         try:
-            urllib.request.urlretrieve(url, fa_zip)
-            print_success("Download abgeschlossen")
+            archive = self.obtain_fontawesome_archive()
+            print_success(f"Archiv geprüft: {archive}")
+            
+            if self.icon_source == "zip":
+                # Icons werden direkt aus dem Archiv gelesen
+                self.fa_archive = archive
+                return True
             
-            print_info("Entpacke Font Awesome...")
-            with zipfile.ZipFile(fa_zip, 'r') as zip_ref:
-                zip_ref.extractall(self.fa_dir)
+            # Unverändertes Archiv nicht erneut entpacken
+            digest = fontawesome.sha256_file(archive)
+            if find_svgs_roots(self.fa_dir) and fontawesome.extracted_digest(self.fa_dir) == digest:
+                print_info("Archiv unverändert, überspringe Entpacken")
+                return True
             
-            print_success("Font Awesome entpackt")
-            fa_zip.unlink()
+            print_info("Entpacke SVGs...")
+            count = fontawesome.extract_svgs(archive, self.fa_dir, digest)
+            print_success(f"{count} SVGs entpackt")
+            return True
             
         except Exception as e:
             print_warning(f"Automatischer Download fehlgeschlagen: {e}")
-            print_info("Bitte lade Font Awesome manuell herunter:")
+            print_info("Lokales Archiv verwenden: --fa-zip <pfad>/fontawesome-free-*-web.zip")
+            print_info("Oder Font Awesome manuell herunterladen:")
             print_info("1. Gehe zu: https://fontawesome.com/download")
             print_info("2. Lade 'Free For Web' herunter")
             print_info(f"3. Entpacke das Archiv nach: {self.fa_dir}")
+            if self.offline or self.icon_source == "zip" or not sys.stdin.isatty():
+                return False
             input("\nDrücke ENTER wenn bereit...")
+            return bool(find_svgs_roots(self.fa_dir))
+    
+    def load_icon_index(self):
+        """Lade (oder baue) den Icon-Index der gewählten Icon-Quelle"""
+        if self.icon_index is None:
+            if self.icon_source == "zip":
+                self.icon_index = ZipIconIndex(self.fa_archive or self.obtain_fontawesome_archive())
+            else:
+                self.icon_index = IconIndex.load_or_build(self.fa_dir)
+            if not self.icon_index:
+                print_warning("Keine Font Awesome SVGs gefunden!")
+            else:
+                print_info(f"Icon-Index: {len(self.icon_index)} Icons")
+        return self.icon_index
     
-    def copy_svgs(self):
-        """Kopiere und benenne SVGs basierend auf Mapping"""
+    def resolve_svg_sources(self):
+        """Ermittle Quell-SVG für jeden gemappten POI-Typ"""
+        index = self.load_icon_index()
+        
+        sources = {}
+        not_found = []
+        classes = self.load_classes()
+        self.pruned = [] if classes is not None else None
+        
+        for poi_type, icon_name in self.mapping.items():
+            if classes is not None and classes.get(poi_type, 0) < self.min_count:
+                self.pruned.append(poi_type)
+                continue
+            entry = index.lookup(icon_name)
+            if entry is None:
+                # Icon eines allgemeineren Typs verwenden (z.B. pub → beer → bar)
+                for fallback in REGISTRY.fallback_chain(poi_type)[1:]:
+                    entry = index.lookup(self.mapping.get(fallback, ""))
+                    if entry is not None:
+                        print_info(f"{poi_type}: {icon_name} fehlt, verwende Icon von {fallback}")
+                        break
+            if entry is None:
+                not_found.append((poi_type, icon_name))
+            else:
+                sources[poi_type] = entry
+        
+        return sources, not_found
+    
+    def load_classes(self):
+        """Klassenhäufigkeit, falls mit min_count ausgedünnt werden soll"""
+        if self.histogram_file is None or self.min_count <= 0:
+            return None
+        try:
+            return load_histogram(self.histogram_file)
+        except (OSError, ValueError, KeyError) as e:
+            print_warning(f"Histogramm nicht lesbar, packe alle Icons: {e}")
+            return None
+    
+    def copy_svgs(self, sources=None, not_found=None, previous=(), current=None):
+        """Stage SVGs (Link oder Kopie) basierend auf Mapping.
+        
+        ``current`` sind alle aktuell gemappten POI-Typen, falls ``sources``
+        nur die geänderten enthält (Teil-Rebuild).
+        """
         print_header("Kopiere SVG Icons")
         
-        # Finde Font Awesome SVG-Verzeichnisse
-        fa_svgs_base = None
-        for root, dirs, files in os.walk(self.fa_dir):
-            if 'svgs' in dirs:
-                fa_svgs_base = Path(root) / 'svgs'
-                break
+        if sources is None:
+            sources, not_found = self.resolve_svg_sources()
         
-        if not fa_svgs_base or not fa_svgs_base.exists():
-            print_warning("Font Awesome SVG-Verzeichnis nicht gefunden!")
-            fa_svgs_base = self.fa_dir
+        mode = self.staging_mode
+        if mode == "symlink" and self.backend == "docker":
+            print_warning("Symlinks zeigen aus dem Docker-Mount heraus, verwende 'auto' für spreet")
+            mode = "auto"
         
-        print_info(f"Font Awesome Basis: {fa_svgs_base}")
+        staged = 0
+        unchanged = 0
         
-        copied = 0
-        not_found = []
+        index = self.load_icon_index()
+        cache = self.normalize_cache()
+        normalized = set()
         
-        for poi_type, icon_name in self.mapping.items():
-            svg_found = False
-            
-            for category in ['solid', 'regular', 'brands']:
-                svg_path = fa_svgs_base / category / f"{icon_name}.svg"
-                
-                if svg_path.exists():
-                    dest = self.svg_dir / f"{poi_type}.svg"
-                    shutil.copy2(svg_path, dest)
-                    print_success(f"{poi_type:30} → {icon_name}.svg ({category})")
-                    copied += 1
-                    svg_found = True
-                    break
-            
-            if not svg_found:
-                for svg_file in fa_svgs_base.rglob(f"{icon_name}.svg"):
-                    dest = self.svg_dir / f"{poi_type}.svg"
-                    shutil.copy2(svg_file, dest)
-                    print_success(f"{poi_type:30} → {icon_name}.svg (gefunden)")
-                    copied += 1
-                    svg_found = True
-                    break
-                
-                if not svg_found:
-                    not_found.append((poi_type, icon_name))
-                    print_warning(f"Nicht gefunden: {icon_name}.svg für {poi_type}")
+        for poi_type, (location, category) in sources.items():
+            dest = self.svg_dir / f"{poi_type}.svg"
+            if cache is not None:
+                # Normalisierte Fassung aus dem Cache verlinken
+                with self.profiler.stage("normalize_svgs"):
+                    cached = cache.get(index.read_bytes(location))
+                normalized.add(cached)
+                used = stage_file(cached, dest, mode)
+            elif isinstance(index, ZipIconIndex):
+                used = stage_bytes(index.read_bytes(location), dest)
+            else:
+                used = stage_file(location, dest, mode)
+            if used is None:
+                unchanged += 1
+                continue
+            print_success(f"{poi_type:30} → {self.mapping[poi_type]}.svg ({category}, {used})")
+            staged += 1
+        
+        # Nur selbst gestagte SVGs entfernen, eigene Dateien im svgs-Dir bleiben
+        stale = sorted(set(previous) - set(sources if current is None else current))
+        removed = remove_stale(self.svg_dir, stale)
+        if cache is not None and current is None:
+            cache.prune(normalized)
+        
+        self.profiler.count("icons_staged", staged)
+        self.profiler.count("icons_unchanged", unchanged)
+        self.profiler.count("icons_removed", removed)
+        self.profiler.count("icons_not_found", len(not_found))
+        for poi_type in stale:
+            print_info(f"Entfernt: {poi_type}.svg (nicht mehr im Mapping)")
+        
+        for poi_type, icon_name in not_found:
+            print_warning(f"Nicht gefunden: {icon_name}.svg für {poi_type}")
         
         print()
-        print_success(f"{copied} SVGs erfolgreich kopiert")
+        print_success(f"{staged} SVGs aktualisiert, {unchanged} unverändert, {removed} entfernt")
         
         if not_found:
             print_warning(f"{len(not_found)} Icons nicht gefunden:")
             for poi, icon in not_found[:10]:
                 print(f"  - {poi} → {icon}")
     
+    def source_keys(self, sources):
+        """Inhaltsschlüssel der Quell-SVG je POI-Typ"""
+        index = self.load_icon_index()
+        source_hashes = {}
+        content_keys = {}
+        for poi_type, (location, _) in sources.items():
+            if location not in content_keys:
+                content_keys[location] = index.content_key(location)
+            source_hashes[poi_type] = content_keys[location]
+        return source_hashes
+    
+    def svg_stage_key(self, sources, source_keys=None):
+        """Hash über Mapping und Inhalt aller Quell-SVGs"""
+        if source_keys is None:
+            source_keys = self.source_keys(sources)
+        return hash_json({"mapping": self.mapping, "sources": source_keys,
+                          "normalize": self.normalize_options()})
+    
+    def changed_poi_types(self):
+        """POI-Typen, deren Mapping sich seit dem letzten Build geändert hat.
+        
+        None, wenn kein vorheriger Build im Manifest steht.
+        """
+        previous = self.manifest.stages.get("svgs", {}).get("mapping")
+        if previous is None:
+            return None
+        return diff_mappings(previous, self.mapping)
+    
+    def normalize_options(self):
+        if not self.normalize_svgs:
+            return None
+        return {"size": self.icon_size, "padding": self.icon_padding}
+    
+    def normalize_cache(self):
+        """Cache normalisierter SVGs (None wenn abgeschaltet)"""
+        options = self.normalize_options()
+        return NormalizeCache(self.normalized_dir, **options) if options else None
+    
+    @property
+    def source_dir(self):
+        """Eingabe für spreet/Packer: alle gestagten SVGs oder die Style-Teilmenge"""
+        return self.subset_dir if self.style_file else self.svg_dir
+    
+    def stage_style_subset(self):
+        """Verlinke die vom Style erreichbaren SVGs nach subset/"""
+        print_header("Style-Teilmenge")
+        style = load_style(self.style_file)
+        candidates = {svg.stem for svg in self.svg_dir.glob("*.svg")}
+        reachable, missing = reachable_icons(style, candidates)
+        
+        self.subset_dir.mkdir(parents=True, exist_ok=True)
+        # Symlinks würden aus dem Docker-Mount herauszeigen
+        mode = "auto" if self.staging_mode == "symlink" else self.staging_mode
+        for name in sorted(reachable):
+            stage_file((self.svg_dir / f"{name}.svg").resolve(), self.subset_dir / f"{name}.svg", mode)
+        stale = [svg.stem for svg in self.subset_dir.glob("*.svg") if svg.stem not in reachable]
+        remove_stale(self.subset_dir, stale)
+        
+        print_success(f"{len(reachable)} von {len(candidates)} Icons vom Style erreichbar")
+        for name in sorted(missing):
+            print_warning(f"Im Style referenziert, aber nicht gemappt: {name}")
+        self.style_report = {
+            "file": str(self.style_file),
+            "icons": len(reachable),
+            "available": len(candidates),
+            "missing": sorted(missing),
+        }
+    
+    def stage_shards(self):
+        """Verteile die SVGs nach POI-Kategorie auf shards/<kategorie>/"""
+        print_header("Sprite-Shards")
+        members = {}
+        for svg in sorted(self.source_dir.glob("*.svg")):
+            members.setdefault(REGISTRY.category(svg.stem) or "other", []).append(svg.stem)
+        
+        # Symlinks würden aus dem Docker-Mount herauszeigen
+        mode = "auto" if self.staging_mode == "symlink" else self.staging_mode
+        for shard, names in members.items():
+            directory = self.shard_dir / shard
+            directory.mkdir(parents=True, exist_ok=True)
+            for name in names:
+                stage_file((self.source_dir / f"{name}.svg").resolve(), directory / f"{name}.svg", mode)
+            keep = set(names)
+            remove_stale(directory, [svg.stem for svg in directory.glob("*.svg") if svg.stem not in keep])
+        if self.shard_dir.exists():
+            for directory in self.shard_dir.iterdir():
+                if directory.is_dir() and directory.name not in members:
+                    shutil.rmtree(directory)
+        
+        self.shard_members = {shard: members[shard] for shard in sorted(members)}
+        for shard, names in self.shard_members.items():
+            print_success(f"{self.sprite_name}-{shard:20} {len(names):4} Icons")
+    
+    def staged_svgs_present(self, sources):
+        return all((self.svg_dir / f"{poi_type}.svg").exists() for poi_type in sources)
+    
+    def sprite_sets(self):
+        """(Shard-ID, Sprite-Name, SVG-Verzeichnis) je erzeugtem Sprite"""
+        if not self.shard:
+            return [(None, self.sprite_name, self.source_dir)]
+        return [(shard, f"{self.sprite_name}-{shard}", self.shard_dir / shard)
+                for shard in self.shard_members]
+    
+    def sprite_variants(self):
+        """Namen der erzeugten Sprite-Varianten je Pixel-Ratio"""
+        return [(f"{name}{sprite_packer.ratio_suffix(ratio)}", ratio)
+                for _, name, _ in self.sprite_sets() for ratio in self.pixel_ratios]
+    
+    def output_files(self, sprite_name=None):
+        """Ausgabedateien aller Sprites (oder nur von ``sprite_name``)"""
+        files = []
+        for output_name, ratio in self.sprite_variants():
+            if sprite_name and output_name != f"{sprite_name}{sprite_packer.ratio_suffix(ratio)}":
+                continue
+            files.extend([f"{output_name}.png", f"{output_name}.json"])
+        return files
+    
+    def get_docker_image_id(self):
+        """ID des spreet-Images (None falls nicht verfügbar)"""
+        try:
+            result = subprocess.run(
+                ['docker', 'image', 'inspect', '--format', '{{.Id}}', self.docker_image],
+                capture_output=True, text=True
+            )
+        except FileNotFoundError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    
+    def get_spreet_version(self):
+        """Version des lokalen spreet-Binarys (None falls nicht ausführbar)"""
+        try:
+            result = subprocess.run([self.spreet_bin, '--version'], capture_output=True, text=True)
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+    
+    def backend_fingerprint(self):
+        """Identität des Sprite-Backends (None falls nicht verfügbar)"""
+        if self.backend == "native":
+            if sprite_packer.missing_dependencies():
+                return None
+            return {"native": sprite_packer.backend_fingerprint()}
+        if self.spreet_bin:
+            version = self.get_spreet_version()
+            return {"spreet": version} if version else None
+        image_id = self.get_docker_image_id()
+        if image_id is None:
+            return None
+        return {"docker": image_id}
+    
+    def sprite_stage_key(self):
+        """Hash über gestagte SVGs, Sprite-Backend und Sprite-Einstellungen"""
+        backend = self.backend_fingerprint()
+        if backend is None:
+            return None
+        staged = {svg.name: hash_file(svg) for svg in sorted(self.source_dir.glob("*.svg"))}
+        return hash_json({
+            "svgs": staged,
+            "backend": backend,
+            "sprite_name": self.sprite_name,
+            "variants": self.sprite_variants(),
+            "unique": self.unique,
+            "sdf": self.sdf,
+            "packer": self.packer if self.backend == "native" else None,
+            "shards": self.shard_members if self.shard else None,
+            "png_optimize": self.png_optimize,
+            "hashed_output": self.hashed_output,
+        })
+    
+    def outputs_present(self):
+        return all((self.output_dir / name).exists() for name in self.output_files())
+    
+    def stage_svgs(self):
+        """Kopiere SVGs nur wenn sich Mapping oder Quellen geändert haben"""
+        sources, not_found = self.resolve_svg_sources()
+        if self.pruned:
+            self.profiler.count("icons_pruned", len(self.pruned))
+            print_info(f"{len(self.pruned)} POI-Typen mit weniger als {self.min_count} "
+                       f"Vorkommen im Archiv ausgelassen")
+        source_keys = self.source_keys(sources)
+        svgs_key = self.svg_stage_key(sources, source_keys)
+        
+        if (not self.force and self.manifest.is_fresh("svgs", svgs_key)
+                and self.staged_svgs_present(sources)):
+            self.changed_types = []
+            print_info("Mapping und Quell-SVGs unverändert, überspringe Kopieren")
+            return
+        
+        last = self.manifest.stages.get("svgs", {})
+        previous = last.get("staged", [])
+        changed = self.changed_poi_types()
+        if changed is not None:
+            # Geänderte Mappings und geänderte (oder neu hinzugekommene) Quell-SVGs
+            last_keys = last.get("sources", {})
+            changed = sorted(set(changed) | {poi_type for poi_type in sources
+                                             if last_keys.get(poi_type) != source_keys[poi_type]})
+        # Neue Typen haben noch kein gestagtes SVG, nur die übrigen müssen vorhanden sein
+        if (self.force or changed is None or last.get("normalize") != self.normalize_options()
+                or not self.staged_svgs_present(set(sources) - set(changed))):
+            self.changed_types = None
+            self.copy_svgs(sources, not_found, previous)
+        else:
+            # Teil-Rebuild
+            self.changed_types = changed
+            print_info(f"{len(changed)} POI-Typen seit dem letzten Build geändert")
+            self.copy_svgs({poi_type: sources[poi_type] for poi_type in changed if poi_type in sources},
+                           not_found, previous, current=sources)
+        self.manifest.record("svgs", svgs_key, count=len(sources), staged=sorted(sources),
+                             mapping=self.mapping, sources=source_keys,
+                             normalize=self.normalize_options())
+    
     def check_docker(self):
-        """Prüfe ob Docker läuft"""
+        """Prüfe ob Docker läuft (einmal pro Prozess)"""
         print_header("Prüfe Docker")
         
+        if "docker" in _DOCKER_CHECKS:
+            print_info("Docker-Status aus dieser Sitzung übernommen")
+            return _DOCKER_CHECKS["docker"]
+        
         try:
             result = subprocess.run(['docker', 'ps'], 
                                   capture_output=True, text=True)
             if result.returncode == 0:
                 print_success("Docker läuft")
+                _DOCKER_CHECKS["docker"] = True
                 return True
             else:
                 print_warning("Docker läuft nicht")
@@ -193,6 +652,10 @@ class POISpriteBuilder:
         """Baue spreet Docker-Image falls nicht vorhanden"""
         print_header("Prüfe spreet Docker-Image")
         
+        if _DOCKER_CHECKS.get(f"image:{self.docker_image}"):
+            print_info(f"Docker-Image '{self.docker_image}' in dieser Sitzung bereits geprüft")
+            return True
+        
         # Prüfe ob Image existiert
         result = subprocess.run(
             ['docker', 'images', '-q', self.docker_image],
@@ -201,6 +664,7 @@ class POISpriteBuilder:
         
         if result.stdout.strip():
             print_success(f"Docker-Image '{self.docker_image}' bereits vorhanden")
+            _DOCKER_CHECKS[f"image:{self.docker_image}"] = True
             return True
         
         print_info(f"Baue Docker-Image '{self.docker_image}'...")
@@ -215,6 +679,7 @@ class POISpriteBuilder:
             
             if result.returncode == 0:
                 print_success(f"Docker-Image erfolgreich gebaut")
+                _DOCKER_CHECKS[f"image:{self.docker_image}"] = True
                 return True
             else:
                 print_warning(f"Fehler beim Bauen: {result.stderr}")
@@ -224,82 +689,299 @@ class POISpriteBuilder:
             print_warning(f"Fehler: {e}")
             return False
     
+    def start_worker(self):
+        """Starte (oder übernimm) den warmen spreet-Container"""
+        if self.worker is None:
+            # tmp/ enthält die Staging-Verzeichnisse bei atomarem Publish
+            sources = self.shard_dir if self.shard else self.source_dir
+            mounts = {sources: "/sources", self.tmp_dir: "/staging"}
+            if not self.atomic_publish:
+                mounts[self.output_dir] = "/output"
+            self.worker = SpreetWorker(self.docker_image, mounts)
+        
+        if not self.owns_worker:
+            return
+        if self.worker.start():
+            print_success(f"spreet-Worker gestartet: {self.worker.name}")
+        else:
+            print_info(f"Verwende laufenden spreet-Worker: {self.worker.name}")
+    
+    def stop_worker(self):
+        if self.worker is not None and self.owns_worker and not self.keep_worker:
+            self.worker.stop()
+            print_info(f"spreet-Worker beendet: {self.worker.name}")
+    
     def build_sprites_with_docker(self):
         """Erstelle Sprites mit Docker-spreet"""
         print_header("Erstelle Sprites mit Docker")
         
-        if not self.check_docker():
-            print_warning("Docker nicht verfügbar")
-            return False
-        
-        if not self.build_docker_image():
-            print_warning("Docker-Image nicht verfügbar")
-            return False
+        if self.spreet_bin:
+            print_info(f"Verwende lokales spreet: {self.spreet_bin}")
+        else:
+            if not self.check_docker():
+                print_warning("Docker nicht verfügbar")
+                return False
+            
+            if not self.build_docker_image():
+                print_warning("Docker-Image nicht verfügbar")
+                return False
         
-        svg_count = len(list(self.svg_dir.glob("*.svg")))
+        svg_count = len(list(self.source_dir.glob("*.svg")))
         if svg_count == 0:
             print_warning("Keine SVG-Dateien zum Verarbeiten gefunden!")
             return False
         
         print_info(f"Verarbeite {svg_count} SVG-Dateien...")
         
-        # Erstelle Sprites in verschiedenen Auflösungen
-        for retina in [False, True]:
-            suffix = "@2x" if retina else ""
-            output_name = f"{self.sprite_name}{suffix}"
-            
-            print_info(f"Erstelle {output_name}...")
-            
-            # Docker-Command zusammenbauen
-            cmd = [
-                'docker', 'run', '--rm',
-                '--entrypoint', '/app/spreet',
-                '-v', f"{self.svg_dir.absolute()}:/sources",
-                '-v', f"{self.output_dir.absolute()}:/output",
-                self.docker_image
-            ]
-            
-            if retina:
-                cmd.append('--retina')
+        if (self.warm_worker or self.worker is not None) and not self.spreet_bin:
+            try:
+                self.start_worker()
+            except SpreetWorkerError as e:
+                print_warning(f"Worker-Start fehlgeschlagen, verwende docker run: {e}")
+                self.worker = None
+        
+        # Alle Shards und Auflösungen parallel (ein spreet-Lauf je Sheet)
+        jobs = [(source_dir, f"{name}{sprite_packer.ratio_suffix(ratio)}", ratio)
+                for _, name, source_dir in self.sprite_sets() for ratio in self.pixel_ratios]
+        with self.profiler.stage("spreet"), \
+                ThreadPoolExecutor(max_workers=min(self.jobs, len(jobs))) as executor:
+            results = list(executor.map(lambda job: self.run_spreet(*job), jobs))
+        
+        return all(results)
+    
+    def spreet_args(self, sources, output, ratio):
+        """spreet-Argumente für eine Variante"""
+        args = []
+        if ratio != 1:
+            args.extend(['--ratio', f"{ratio:g}"])
+        
+        # Inhaltsgleiche Icons nur einmal packen (Aliase im Index)
+        if self.unique:
+            args.append('--unique')
+        
+        if self.sdf:
+            args.append('--sdf')
+        
+        args.extend([sources, output])
+        return args
+    
+    def run_spreet(self, source_dir, output_name, ratio):
+        """Erstelle eine Sprite-Variante mit spreet (Worker, lokal oder docker run)"""
+        print_info(f"Erstelle {output_name}...")
+        
+        try:
+            with self.profiler.stage(f"spreet_{output_name}"):
+                if self.spreet_bin:
+                    args = self.spreet_args(str(source_dir), str(self.target_dir / output_name), ratio)
+                    result = subprocess.run([self.spreet_bin] + args, capture_output=True, text=True)
+                elif self.worker is not None:
+                    sources = self.worker.container_path(source_dir)
+                    output = self.worker.container_path(self.target_dir / output_name)
+                    result = self.worker.exec(self.spreet_args(sources, output, ratio))
+                else:
+                    # Docker-Command zusammenbauen
+                    cmd = [
+                        'docker', 'run', '--rm',
+                        '--entrypoint', '/app/spreet',
+                        '-v', f"{source_dir.absolute()}:/sources",
+                        '-v', f"{self.target_dir.absolute()}:/output",
+                        self.docker_image
+                    ]
+                    cmd.extend(self.spreet_args('/sources', f'/output/{output_name}', ratio))
+                    result = subprocess.run(cmd, capture_output=True, text=True)
             
-            cmd.extend(['/sources', f'/output/{output_name}'])
+            if result.returncode == 0:
+                print_success(f"{output_name}.png erstellt")
+                print_success(f"{output_name}.json erstellt")
+                return True
             
-            try:
-                result = subprocess.run(cmd, capture_output=True, text=True)
+            print_warning(f"Fehler: {result.stderr}")
+            return False
                 
-                if result.returncode == 0:
-                    print_success(f"{output_name}.png erstellt")
-                    print_success(f"{output_name}.json erstellt")
-                else:
-                    print_warning(f"Fehler: {result.stderr}")
-                    
-            except Exception as e:
-                print_warning(f"Fehler beim Ausführen: {e}")
+        except Exception as e:
+            print_warning(f"Fehler beim Ausführen: {e}")
+            return False
+    
+    def build_sprites_native(self):
+        """Erstelle Sprites mit dem nativen Python-Packer"""
+        print_header("Erstelle Sprites (nativ)")
+        
+        missing = sprite_packer.missing_dependencies(self.sdf)
+        if missing:
+            print_warning(f"Natives Backend benötigt: {', '.join(missing)}")
+            print_info(f"Installieren mit: pip install {' '.join(missing)}")
+            return False
+        
+        svg_count = len(list(self.source_dir.glob("*.svg")))
+        if svg_count == 0:
+            print_warning("Keine SVG-Dateien zum Verarbeiten gefunden!")
+            return False
+        
+        print_info(f"Verarbeite {svg_count} SVG-Dateien...")
+        
+        ratios = ", ".join(f"{ratio:g}x" for ratio in self.pixel_ratios)
+        print_info(f"Rendere {ratios} mit {self.jobs} Prozessen...")
+        
+        cache = RasterCache(self.raster_cache_dir, self.raster_cache_bytes) if self.raster_cache else None
+        
+        def pack(sprite_set, executor):
+            _, name, source_dir = sprite_set
+            return sprite_packer.build_sprites(
+                source_dir, self.target_dir, name,
+                pixel_ratios=self.pixel_ratios, workers=self.jobs, unique=self.unique,
+                executor=executor, sdf=self.sdf, packer=self.packer, cache=cache)
+        
+        sprite_sets = self.sprite_sets()
+        try:
+            if len(sprite_sets) == 1:
+                results = [pack(sprite_sets[0], self.executor)]
+            else:
+                # Shards parallel packen, gerendert wird in einem gemeinsamen Pool
+                pool = self.executor or ProcessPoolExecutor(max_workers=self.jobs)
+                try:
+                    with ThreadPoolExecutor(max_workers=min(self.jobs, len(sprite_sets))) as threads:
+                        results = list(threads.map(lambda sprite_set: pack(sprite_set, pool), sprite_sets))
+                finally:
+                    if pool is not self.executor:
+                        pool.shutdown()
+        except Exception as e:
+            print_warning(f"Fehler beim Packen: {e}")
+            return False
+        
+        packed = sum(count for count, _ in results)
+        self.packers_used = {}
+        for _, packers in results:
+            self.packers_used.update(packers)
+        
+        if cache is not None:
+            evicted, cache_bytes = cache.evict()
+            self.raster_stats = {"hits": cache.hits, "rendered": cache.misses,
+                                 "evicted": evicted, "bytes": cache_bytes}
+            self.profiler.count("raster_cache_hits", cache.hits)
+            self.profiler.count("raster_cache_misses", cache.misses)
+            print_info(f"Raster-Cache: {cache.hits} Treffer, {cache.misses} gerendert, "
+                       f"{cache_bytes / 1024 / 1024:.1f} MB, {evicted} verdrängt")
+        
+        if packed < svg_count:
+            print_info(f"{packed} eindeutige Bilder für {svg_count} Icons gepackt")
+        
+        for output_name, _ in self.sprite_variants():
+            print_success(f"{output_name}.png erstellt")
+            print_success(f"{output_name}.json erstellt")
+        
+        return True
+    
+    def build_sprites(self):
+        """Erstelle Sprites mit dem gewählten Backend"""
+        if self.backend == "native":
+            return self.build_sprites_native()
+        return self.build_sprites_with_docker()
+    
+    def optimize_pngs(self):
+        """Verlustfreie Rekompression / Palettenquantisierung der Sheets"""
+        if self.png_optimize == "off":
+            return
+        
+        print_header("Optimiere PNGs")
+        
+        for output_name, _ in self.sprite_variants():
+            png_file = self.target_dir / f"{output_name}.png"
+            if not png_file.exists():
+                continue
+            stats = optimize_png(png_file, self.png_optimize)
+            self.png_stats[png_file.name] = stats
+            saved = stats["before"] - stats["after"]
+            percent = 100 * saved / stats["before"] if stats["before"] else 0
+            print_success(f"{png_file.name}: {stats['before']} → {stats['after']} Bytes (-{percent:.1f}%)")
+    
+    def publish_hashed(self):
+        """Content-gehashte Kopien + vorkomprimiertes JSON für das CDN"""
+        if not self.hashed_output:
+            return
+        
+        print_header("Veröffentliche gehashte Artefakte")
+        
+        if self.shard:
+            # Eigener Hash und eigenes Manifest je Shard
+            for shard, name, _ in self.sprite_sets():
+                manifest = publish_hashed(self.target_dir, name, self.output_files(name))
+                self.shard_manifests[shard] = manifest
+                print_success(f"{name}: {manifest['sprite']} ({name}.manifest.json)")
+            return
+        
+        self.hashed_manifest = publish_hashed(self.target_dir, self.sprite_name, self.output_files())
+        print_success(f"Aktueller Sprite: {self.hashed_manifest['sprite']}")
+        print_success(f"Manifest: {self.sprite_name}.manifest.json")
+    
+    def begin_release(self):
+        """Leite Schreib-Stufen in ein frisches Staging-Verzeichnis um"""
+        if not self.atomic_publish:
+            return
+        
+        self.target_dir = release_publisher.create_staging_dir(self.tmp_dir)
+        print_info(f"Staging: {self.target_dir}")
         
+        # Gehashte Artefakte alter Stände weiterreichen (werden nie überschrieben)
+        if self.hashed_output and self.output_dir.exists():
+            sprite_names = [name for _, name, _ in self.sprite_sets()]
+            names = [p.name for p in self.output_dir.iterdir()
+                     if any(is_artifact(p.name, sprite_name) for sprite_name in sprite_names)]
+            release_publisher.seed_staging(self.target_dir, self.output_dir, names)
+    
+    def abort_release(self):
+        if self.target_dir != self.output_dir and self.target_dir.exists():
+            shutil.rmtree(self.target_dir)
+        self.target_dir = self.output_dir
+    
+    def finish_release(self):
+        """Schalte output_dir atomar auf das Staging-Verzeichnis um"""
+        if self.target_dir == self.output_dir:
+            return
+        
+        print_header("Veröffentliche Release")
+        release = release_publisher.publish(self.target_dir, self.output_dir, self.keep_releases)
+        self.target_dir = self.output_dir
+        print_success(f"{self.output_dir} → {release}")
+    
+    def rollback(self, steps=1):
+        """Aktiviere ein früheres Release"""
+        print_header("Rollback")
+        release = release_publisher.rollback(self.output_dir, steps)
+        if release is None:
+            print_warning("Kein früheres Release vorhanden")
+            return False
+        print_success(f"{self.output_dir} → {release}")
         return True
     
     def generate_docs(self):
         """Erstelle Dokumentation"""
         print_header("Erstelle Dokumentation")
         
-        # README für output dir
-        readme = self.output_dir / "README.md"
-        with open(readme, 'w') as f:
-            f.write(f"""# POI Sprites
-
-Automatisch generierte Sprites für PMTiles POI-Layer.
-
-## Dateien
-
-- `{self.sprite_name}.png` - Sprite-Sheet (1x)
-- `{self.sprite_name}.json` - Sprite-Metadaten (1x)
-- `{self.sprite_name}@2x.png` - Sprite-Sheet (2x Retina)
-- `{self.sprite_name}@2x.json` - Sprite-Metadaten (2x)
-
-## MapLibre Verwendung
-
-```json
-{{
+        file_list = "\n".join(
+            f"- `{name}.png` - Sprite-Sheet ({ratio:g}x)\n- `{name}.json` - Sprite-Metadaten ({ratio:g}x)"
+            for name, ratio in self.sprite_variants()
+        )
+        
+        for shard, manifest in self.shard_manifests.items():
+            file_list += (f"\n- `{self.sprite_name}-{shard}.manifest.json` - Zeigt auf den aktuellen Hash"
+                          f" (`{manifest['sprite']}`)")
+        if self.hashed_manifest:
+            file_list += (
+                f"\n- `{self.sprite_name}.manifest.json` - Zeigt auf den aktuellen Hash"
+                f" (`{self.hashed_manifest['sprite']}`, unveränderlich cachebar)"
+            )
+        
+        # SDF-Icons werden erst im Style eingefärbt
+        color_layout = ""
+        if self.sdf:
+            color_layout = """,
+      "paint": {
+        "icon-color": "#1f4e79",
+        "icon-halo-color": "#ffffff",
+        "icon-halo-width": 1
+      }"""
+        
+        style_snippet = f"""{{
   "sprite": "https://tiles.oe5ith.at/assets/sprites/poi/{self.sprite_name}",
   "layers": [
     {{
@@ -310,10 +992,28 @@ Automatisch generierte Sprites für PMTiles POI-Layer.
       "layout": {{
         "icon-image": ["get", "class"],
         "icon-size": 0.8
-      }}
+      }}{color_layout}
     }}
   ]
-}}
+}}"""
+        if self.shard:
+            style_snippet = self.multi_sprite_snippet()
+        
+        # README für output dir
+        readme = self.target_dir / "README.md"
+        with open(readme, 'w') as f:
+            f.write(f"""# POI Sprites
+
+Automatisch generierte Sprites für PMTiles POI-Layer.
+
+## Dateien
+
+{file_list}
+
+## MapLibre Verwendung
+
+```json
+{style_snippet}
 ```
 
 ## Gemappte POI-Typen: {len(self.mapping)}
@@ -325,54 +1025,184 @@ Basiert auf Font Awesome Free Icons.
         
         # Info in build dir
         info_file = self.build_dir / "build_info.json"
+        info = {
+            "sprite_name": self.sprite_name,
+            "total_pois": len(REGISTRY) if self.registry_mapping else len(self.mapping),
+            "mapped_pois": len(self.mapping),
+            "output_dir": str(self.output_dir),
+            "files": self.output_files()
+        }
+        if self.hashed_manifest:
+            info["hashed"] = self.hashed_manifest
+        if self.sdf:
+            info["sdf"] = True
+        if self.changed_types is not None:
+            info["changed_poi_types"] = self.changed_types
+        if self.style_report:
+            info["style"] = self.style_report
+        if self.shard:
+            info["shards"] = {f"{self.sprite_name}-{shard}": len(names)
+                              for shard, names in self.shard_members.items()}
+            if self.shard_manifests:
+                info["hashed"] = {f"{self.sprite_name}-{shard}": manifest
+                                  for shard, manifest in self.shard_manifests.items()}
+        if self.pruned is not None:
+            info["histogram"] = {"file": str(self.histogram_file), "min_count": self.min_count,
+                                 "pruned": sorted(self.pruned)}
+        if self.raster_stats:
+            info["raster_cache"] = self.raster_stats
+        info["packing"] = self.packing_stats()
+        if self.png_stats:
+            info["png_optimization"] = {"mode": self.png_optimize, "files": self.png_stats}
         with open(info_file, 'w') as f:
-            json.dump({
-                "sprite_name": self.sprite_name,
-                "total_pois": len(ALL_POI_TYPES),
-                "mapped_pois": len(self.mapping),
-                "output_dir": str(self.output_dir),
-                "files": [
-                    f"{self.sprite_name}.png",
-                    f"{self.sprite_name}.json",
-                    f"{self.sprite_name}@2x.png",
-                    f"{self.sprite_name}@2x.json"
-                ]
-            }, f, indent=2)
+            json.dump(info, f, indent=2)
         
         print_success(f"Build-Info erstellt: {info_file}")
     
+    def multi_sprite_snippet(self):
+        """MapLibre-Style mit ``sprite``-Array, je Shard ein Eintrag.
+        
+        Icons eines Multi-Sprites heißen ``<id>:<name>``, die Klasse wird
+        daher per ``match`` ihrem Shard zugeordnet.
+        """
+        base_url = "https://tiles.oe5ith.at/assets/sprites/poi"
+        sprites = []
+        icon_image = ["match", ["get", "class"]]
+        for shard, names in self.shard_members.items():
+            manifest = self.shard_manifests.get(shard)
+            name = manifest["sprite"] if manifest else f"{self.sprite_name}-{shard}"
+            sprites.append({"id": shard, "url": f"{base_url}/{name}"})
+            icon_image.extend([names, ["concat", f"{shard}:", ["get", "class"]]])
+        icon_image.append("")
+        
+        layer = {
+            "id": "poi-icons",
+            "type": "symbol",
+            "source": "pmtiles",
+            "source-layer": "poi",
+            "layout": {"icon-image": icon_image, "icon-size": 0.8},
+        }
+        if self.sdf:
+            layer["paint"] = {"icon-color": "#1f4e79", "icon-halo-color": "#ffffff", "icon-halo-width": 1}
+        return json.dumps({"sprite": sprites, "layers": [layer]}, indent=2, ensure_ascii=False)
+    
+    def packing_stats(self):
+        """Sheet-Größe und Füllgrad je Variante (spreet oder nativer Packer)"""
+        stats = {}
+        for output_name, _ in self.sprite_variants():
+            try:
+                entry = sprite_packer.sheet_stats(self.target_dir / output_name)
+            except (OSError, ValueError, KeyError, struct.error) as e:
+                print_warning(f"Packing-Statistik für {output_name} nicht lesbar: {e}")
+                continue
+            entry["packer"] = self.packers_used.get(output_name, "spreet")
+            print_info(f"{output_name}: {entry['width']}×{entry['height']} px, "
+                       f"Füllgrad {entry['fill']:.1%} ({entry['packer']})")
+            stats[output_name] = entry
+        return stats
+    
+    def count_output_bytes(self):
+        """Summe der geschriebenen Ausgabedateien"""
+        total = sum(path.stat().st_size for path in self.target_dir.iterdir() if path.is_file())
+        self.profiler.count("bytes_written", total)
+    
+    def write_profile(self):
+        """Schreibe Stufen-Timings als JSON und Prometheus-Textfile"""
+        print_header("Profil")
+        for line in self.profiler.summary_lines():
+            print(f"  {line}")
+        print(f"  {'gesamt':24} {self.profiler.total() * 1000:10.1f} ms")
+        
+        if not self.profile:
+            return
+        json_file = self.build_dir / "build_profile.json"
+        prom_file = self.build_dir / "build_profile.prom"
+        self.profiler.write_json(json_file)
+        self.profiler.write_prometheus(prom_file)
+        print_success(f"Profil geschrieben: {json_file}, {prom_file}")
+    
     def run(self):
         """Führe kompletten Build-Prozess aus"""
+        stage = self.profiler.stage
         try:
-            self.setup_directories()
-            if not self.load_existing_mapping(required=True):
-                sys.exit(1)
-            self.download_fontawesome()
-            self.copy_svgs()
+            with stage("setup"):
+                self.setup_directories()
+            with stage("load_mapping"):
+                if not self.load_existing_mapping(required=True):
+                    sys.exit(1)
+                self.manifest.load()
+            with stage("download_fontawesome"):
+                if not self.download_fontawesome():
+                    print_warning("Font Awesome nicht verfügbar")
+                    sys.exit(1)
+            with stage("stage_svgs"):
+                self.stage_svgs()
+            if self.style_file:
+                with stage("style_subset"):
+                    self.stage_style_subset()
+            if self.shard:
+                with stage("stage_shards"):
+                    self.stage_shards()
+            
+            with stage("check_fresh"):
+                sprites_key = self.sprite_stage_key()
+                fresh = (not self.force and sprites_key is not None
+                         and self.manifest.is_fresh("sprites", sprites_key)
+                         and self.outputs_present())
+            if fresh:
+                self.profiler.count("sprites_skipped")
+                self.profiler.success = True
+                print_header("Keine Änderungen")
+                print_success("Sprites sind aktuell, überspringe Sprite-Erstellung")
+                print_info(f"Ausgabe: {self.output_dir}")
+                return
             
-            if self.build_sprites_with_docker():
-                self.generate_docs()
+            self.begin_release()
+            with stage("build_sprites"):
+                built = self.build_sprites()
+            if built:
+                with stage("optimize_png"):
+                    self.optimize_pngs()
+                with stage("publish_hashed"):
+                    self.publish_hashed()
+                with stage("generate_docs"):
+                    self.generate_docs()
+                self.count_output_bytes()
+                with stage("publish_release"):
+                    self.finish_release()
+                # Image-ID erst nach build_docker_image() sicher verfügbar
+                sprites_key = sprites_key or self.sprite_stage_key()
+                if sprites_key is not None:
+                    self.manifest.record("sprites", sprites_key, files=self.output_files())
+                self.profiler.success = True
                 
                 print_header("✨ Fertig! ✨")
                 print_success("POI-Sprites erfolgreich erstellt!")
                 print_info(f"Ausgabe: {self.output_dir}")
                 print()
                 print_info("Sprite-URL für MapLibre:")
-                print(f"  https://tiles.oe5ith.at/assets/sprites/poi/{self.sprite_name}")
+                for _, name, _ in self.sprite_sets():
+                    print(f"  https://tiles.oe5ith.at/assets/sprites/poi/{name}")
             else:
+                self.abort_release()
                 print_warning("Sprite-Generierung fehlgeschlagen")
             
         except KeyboardInterrupt:
+            self.abort_release()
             print()
             print_warning("Abgebrochen durch Benutzer")
             print_info(f"Fortschritt gespeichert in: {self.mapping_file}")
             sys.exit(1)
         except Exception as e:
+            self.abort_release()
             print()
             print_warning(f"Fehler: {e}")
             import traceback
             traceback.print_exc()
             sys.exit(1)
+        finally:
+            self.stop_worker()
+            self.write_profile()
 
 
 if __name__ == "__main__":
@@ -381,12 +1211,118 @@ if __name__ == "__main__":
     parser.add_argument("--output-dir", default=os.getenv("OUTPUT_DIR", "/srv/assets/sprites/poi"))
     parser.add_argument("--docker-image", default=os.getenv("DOCKER_IMAGE", "local-spreet-builder"))
     parser.add_argument("--sprite-name", default=os.getenv("SPRITE_NAME", "poi"))
+    parser.add_argument("--force", action="store_true",
+                        help="Ignoriere das Build-Manifest und baue alle Stufen neu")
+    parser.add_argument("--backend", choices=BACKENDS, default=os.getenv("SPRITE_BACKEND", "docker"),
+                        help="Sprite-Backend: Docker-spreet oder nativer Python-Packer")
+    parser.add_argument("--ratios", default=os.getenv("PIXEL_RATIOS", "1,2"),
+                        help="Kommagetrennte Pixel-Ratios, z.B. 1,2,3")
+    parser.add_argument("--staging", choices=STAGING_MODES, default=os.getenv("SVG_STAGING", "auto"),
+                        help="Wie SVGs ins Build-Dir gelangen (auto: Reflink → Hardlink → Kopie)")
+    parser.add_argument("--no-unique", dest="unique", action="store_false",
+                        help="Inhaltsgleiche Icons nicht zusammenfassen")
+    parser.add_argument("--sdf", action="store_true",
+                        help="SDF-Sprite erzeugen (Farbe per icon-color im Style)")
+    parser.add_argument("--packer", choices=PACKERS, default=os.getenv("SPRITE_PACKER", "auto"),
+                        help="Bin-Packing des nativen Backends (auto: kleinste Fläche)")
+    parser.add_argument("--style", default=os.getenv("STYLE_FILE"),
+                        help="style.json: nur die von dessen icon-image-Ausdrücken erreichbaren Icons packen")
+    parser.add_argument("--histogram", default=os.getenv("POI_HISTOGRAM"),
+                        help="poi_histogram.json aus poi_histogram.py (für --min-count)")
+    parser.add_argument("--min-count", type=int, default=int(os.getenv("MIN_COUNT", "0")),
+                        help="POI-Typen mit weniger Vorkommen im Archiv nicht packen")
+    parser.add_argument("--shard", action="store_true",
+                        help="Ein Sprite je POI-Kategorie (MapLibre Multi-Sprite)")
+    parser.add_argument("--no-raster-cache", action="store_true",
+                        help="Nativ: jedes Icon neu rastern statt den Raster-Cache zu nutzen")
+    parser.add_argument("--raster-cache-dir", default=os.getenv("RASTER_CACHE_DIR"),
+                        help="Raster-Cache (Standard: <build-dir>/raster_cache)")
+    parser.add_argument("--raster-cache-mb", type=int,
+                        default=int(os.getenv("RASTER_CACHE_MB", DEFAULT_MAX_BYTES // (1024 * 1024))),
+                        help="Größenbudget des Raster-Caches in MB (älteste Einträge werden verdrängt)")
+    parser.add_argument("--normalize-svgs", action="store_true",
+                        help="SVGs auf quadratische viewBox mit Rand normalisieren und Pfade kürzen")
+    parser.add_argument("--icon-size", type=int, default=int(os.getenv("ICON_SIZE", "24")),
+                        help="Icon-Größe in px (1x) bei --normalize-svgs")
+    parser.add_argument("--icon-padding", type=float, default=float(os.getenv("ICON_PADDING", "2")),
+                        help="Rand in px (1x) bei --normalize-svgs, z.B. Platz für Halos")
+    parser.add_argument("--optimize-png", choices=OPTIMIZE_MODES, default=os.getenv("PNG_OPTIMIZE", "off"),
+                        help="PNG-Nachbearbeitung: verlustfrei oder mit Palettenquantisierung")
+    parser.add_argument("--hashed-output", action="store_true",
+                        help="Zusätzlich content-gehashte Dateien, .gz/.br-JSON und ein Manifest schreiben")
+    parser.add_argument("--atomic-publish", action="store_true",
+                        help="In ein Staging-Dir bauen und output-dir atomar per Symlink umschalten")
+    parser.add_argument("--keep-releases", type=int, default=int(os.getenv("KEEP_RELEASES", "3")),
+                        help="Anzahl aufbewahrter Releases für Rollbacks")
+    parser.add_argument("--rollback", action="store_true",
+                        help="Auf das vorherige Release zurückschalten und beenden")
+    parser.add_argument("--profile", action="store_true",
+                        help="Stufen-Timings als build_profile.json/.prom ins Build-Dir schreiben")
+    parser.add_argument("--fa-version", default=os.getenv("FA_VERSION", fontawesome.FA_VERSION))
+    parser.add_argument("--fa-cache-dir", default=os.getenv("FA_CACHE_DIR", fontawesome.DEFAULT_CACHE_DIR),
+                        help="Gemeinsamer Archiv-Cache (ein Zip je Version)")
+    parser.add_argument("--fa-zip", default=os.getenv("FA_ZIP"),
+                        help="Lokales Font Awesome Archiv statt Download")
+    parser.add_argument("--fa-sha256", default=os.getenv("FA_SHA256"),
+                        help="Erwartete SHA-256 Prüfsumme des Archivs")
+    parser.add_argument("--icon-source", choices=ICON_SOURCES, default=os.getenv("ICON_SOURCE", "extracted"),
+                        help="SVGs aus dem entpackten Baum oder direkt aus dem Zip lesen")
+    parser.add_argument("--offline", action="store_true",
+                        help="Kein Netzwerkzugriff und keine Rückfragen")
+    parser.add_argument("--warm-worker", action="store_true",
+                        help="Einen langlebigen spreet-Container per docker exec verwenden")
+    parser.add_argument("--keep-worker", action="store_true",
+                        help="Worker-Container nach dem Lauf weiterlaufen lassen")
+    parser.add_argument("--spreet-bin", default=os.getenv("SPREET_BIN"),
+                        help="Lokales spreet-Binary statt Docker verwenden")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Anzahl paralleler Prozesse (Standard: alle Kerne)")
     args = parser.parse_args()
-
+    
+    pixel_ratios = [parse_ratio(r) for r in args.ratios.split(",") if r.strip()]
+    try:
+        check_ratios(args.backend, pixel_ratios)
+    except ValueError as e:
+        parser.error(str(e))
+    
     builder = POISpriteBuilder(
         build_dir=args.build_dir,
         output_dir=args.output_dir,
         docker_image=args.docker_image,
         sprite_name=args.sprite_name,
+        force=args.force,
+        backend=args.backend,
+        pixel_ratios=pixel_ratios,
+        jobs=args.jobs,
+        staging_mode=args.staging,
+        unique=args.unique,
+        sdf=args.sdf,
+        packer=args.packer,
+        style_file=args.style,
+        histogram_file=args.histogram,
+        min_count=args.min_count,
+        shard=args.shard,
+        raster_cache=not args.no_raster_cache,
+        raster_cache_dir=args.raster_cache_dir,
+        raster_cache_bytes=args.raster_cache_mb * 1024 * 1024,
+        normalize_svgs=args.normalize_svgs,
+        icon_size=args.icon_size,
+        icon_padding=args.icon_padding,
+        png_optimize=args.optimize_png,
+        hashed_output=args.hashed_output,
+        atomic_publish=args.atomic_publish,
+        keep_releases=args.keep_releases,
+        profile=args.profile,
+        fa_version=args.fa_version,
+        fa_cache_dir=args.fa_cache_dir,
+        fa_zip=args.fa_zip,
+        fa_sha256=args.fa_sha256,
+        offline=args.offline,
+        icon_source=args.icon_source,
+        warm_worker=args.warm_worker,
+        keep_worker=args.keep_worker,
+        spreet_bin=args.spreet_bin,
     )
+    if args.rollback:
+        sys.exit(0 if builder.rollback() else 1)
     builder.run()
@@ -14,6 +14,8 @@ DOCKER_IMAGE="${DOCKER_IMAGE:-local-spreet-builder}"
 BUILD_DIR="${BUILD_DIR:-/srv/build/poi-sprites}"
 OUTPUT_DIR="${OUTPUT_DIR:-/srv/assets/sprites/poi}"
 SPRITE_NAME="${SPRITE_NAME:-poi}"
+SPRITE_BACKEND="${SPRITE_BACKEND:-docker}"   # docker | native
+SPREET_BIN="${SPREET_BIN:-}"                 # lokales spreet statt Docker
 SPREET_REPO="https://github.com/flother/spreet.git"
 
 # Farben
@@ -33,40 +35,51 @@ echo ""
 # ==========================================
 echo -e "${BLUE}--- Prüfe Voraussetzungen... ---${NC}"
 
-if ! command -v docker &> /dev/null; then
-    echo -e "${RED}✗ Docker nicht gefunden!${NC}"
-    exit 1
-fi
-echo -e "${GREEN}✓ Docker gefunden${NC}"
-
 if ! command -v python3 &> /dev/null; then
     echo -e "${RED}✗ Python3 nicht gefunden!${NC}"
     exit 1
 fi
 echo -e "${GREEN}✓ Python3 gefunden${NC}"
 
-# Docker läuft?
-if ! docker ps &> /dev/null; then
-    echo -e "${RED}✗ Docker läuft nicht!${NC}"
-    exit 1
+USE_DOCKER=false
+if [ "$SPRITE_BACKEND" = "docker" ] && [ -z "$SPREET_BIN" ]; then
+    USE_DOCKER=true
 fi
-echo -e "${GREEN}✓ Docker läuft${NC}"
 
-# ==========================================
-# 1. DOCKER IMAGE BAUEN (falls nötig)
-# ==========================================
-echo ""
-echo -e "${BLUE}--- Prüfe spreet Docker-Image... ---${NC}"
+if $USE_DOCKER; then
+    if ! command -v docker &> /dev/null; then
+        echo -e "${RED}✗ Docker nicht gefunden!${NC}"
+        exit 1
+    fi
+    echo -e "${GREEN}✓ Docker gefunden${NC}"
 
-if [[ "$(docker images -q $DOCKER_IMAGE 2> /dev/null)" == "" ]]; then
-    echo -e "${YELLOW}⚠ Image nicht gefunden, baue '$DOCKER_IMAGE'...${NC}"
-    if ! docker build -t "$DOCKER_IMAGE" "$SPREET_REPO"; then
-        echo -e "${RED}✗ Docker-Build fehlgeschlagen!${NC}"
+    # Docker läuft?
+    if ! docker ps &> /dev/null; then
+        echo -e "${RED}✗ Docker läuft nicht!${NC}"
         exit 1
     fi
-    echo -e "${GREEN}✓ Docker-Image gebaut${NC}"
+    echo -e "${GREEN}✓ Docker läuft${NC}"
 else
-    echo -e "${GREEN}✓ Docker-Image '$DOCKER_IMAGE' vorhanden${NC}"
+    echo -e "${GREEN}✓ Backend '$SPRITE_BACKEND' (ohne Docker)${NC}"
+fi
+
+# ==========================================
+# 1. DOCKER IMAGE BAUEN (falls nötig)
+# ==========================================
+if $USE_DOCKER; then
+    echo ""
+    echo -e "${BLUE}--- Prüfe spreet Docker-Image... ---${NC}"
+
+    if [[ "$(docker images -q $DOCKER_IMAGE 2> /dev/null)" == "" ]]; then
+        echo -e "${YELLOW}⚠ Image nicht gefunden, baue '$DOCKER_IMAGE'...${NC}"
+        if ! docker build -t "$DOCKER_IMAGE" "$SPREET_REPO"; then
+            echo -e "${RED}✗ Docker-Build fehlgeschlagen!${NC}"
+            exit 1
+        fi
+        echo -e "${GREEN}✓ Docker-Image gebaut${NC}"
+    else
+        echo -e "${GREEN}✓ Docker-Image '$DOCKER_IMAGE' vorhanden${NC}"
+    fi
 fi
 
 # ==========================================
@@ -114,7 +127,8 @@ python3 "$PYTHON_SCRIPT" \
     --build-dir "$BUILD_DIR" \
     --output-dir "$OUTPUT_DIR" \
     --docker-image "$DOCKER_IMAGE" \
-    --sprite-name "$SPRITE_NAME"
+    --sprite-name "$SPRITE_NAME" \
+    --backend "$SPRITE_BACKEND"
 
 exit_code=$?
 
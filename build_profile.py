@@ -0,0 +1,93 @@
+"""Stufen-Timer und Zähler für die Build-Pipeline.
+
+Der Profiler sammelt Laufzeiten je Stufe und Zähler (kopierte Icons,
+fehlende Icons, geschriebene Bytes, ...) und schreibt sie optional als
+JSON und als Prometheus-Textfile (node_exporter textfile collector).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+METRIC_PREFIX = "poi_sprites"
+
+
+class BuildProfiler:
+    def __init__(self, labels=None):
+        self.labels = labels or {}
+        self.stages = {}
+        self.counters = {}
+        self.started = time.time()
+        self.success = False
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name):
+        """Miss die Dauer eines Blocks (mehrfache Aufrufe werden summiert)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def total(self):
+        return time.time() - self.started
+
+    def report(self):
+        return {
+            "labels": self.labels,
+            "started": self.started,
+            "total_seconds": round(self.total(), 6),
+            "success": self.success,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def summary_lines(self):
+        """Stufen absteigend nach Dauer für die Konsolenausgabe"""
+        for name, seconds in sorted(self.stages.items(), key=lambda item: -item[1]):
+            yield f"{name:24} {seconds * 1000:10.1f} ms"
+
+    def write_json(self, path):
+        _write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path):
+        labels = ",".join(f'{key}="{value}"' for key, value in sorted(self.labels.items()))
+
+        def sample(metric, value, extra=""):
+            label_str = ",".join(part for part in (labels, extra) if part)
+            return f"{METRIC_PREFIX}_{metric}{{{label_str}}} {value}"
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_duration_seconds Dauer je Build-Stufe",
+            f"# TYPE {METRIC_PREFIX}_stage_duration_seconds gauge",
+        ]
+        lines += [sample("stage_duration_seconds", f"{seconds:.6f}", f'stage="{name}"')
+                  for name, seconds in sorted(self.stages.items())]
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {METRIC_PREFIX}_{name} gauge", sample(name, value)]
+        lines += [
+            f"# TYPE {METRIC_PREFIX}_duration_seconds gauge",
+            sample("duration_seconds", f"{self.total():.6f}"),
+            f"# TYPE {METRIC_PREFIX}_success gauge",
+            sample("success", int(self.success)),
+            f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge",
+            sample("last_run_timestamp_seconds", int(self.started)),
+        ]
+        _write_atomic(path, "\n".join(lines) + "\n")
+
+
+def _write_atomic(path, text):
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Sprite-Set Batch Builder
+Baut mehrere Sprite-Sets (POI, Maki, Temaki, ...) aus einer Konfigurationsdatei
+in einem Prozess mit gemeinsamem Icon-Index, Worker-Pool und spreet-Worker.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+from build_poi_sprites import (POISpriteBuilder, parse_ratio, print_header, print_success,
+                               print_warning)
+from icon_index import IconIndex
+from spreet_worker import SpreetWorker, SpreetWorkerError
+
+# Schlüssel der Set-Konfiguration, die nicht direkt an POISpriteBuilder gehen
+SET_KEYS = {"name", "mapping", "icons", "ratios", "build_dir"}
+
+EXAMPLE_CONFIG = """{
+  "build_dir": "/srv/build/sprites",
+  "defaults": {"backend": "docker", "ratios": [1, 2], "atomic_publish": true},
+  "sets": [
+    {"name": "poi", "mapping": "/srv/build/poi-sprites/poi_mapping.json",
+     "output_dir": "/srv/assets/sprites/poi", "ratios": [1, 2, 3]},
+    {"name": "sprite", "icons": "/srv/build/maki/icons",
+     "output_dir": "/srv/assets/sprites/maki"}
+  ]
+}"""
+
+
+class SpriteSetBatch:
+    def __init__(self, config, jobs=None, force=False, keep_worker=False):
+        self.build_root = Path(config.get("build_dir", "/srv/build/sprites")).absolute()
+        self.defaults = config.get("defaults", {})
+        self.sets = [{**self.defaults, **entry} for entry in config.get("sets", [])]
+        self.jobs = jobs or os.cpu_count() or 1
+        self.force = force
+        self.keep_worker = keep_worker
+
+        # Geteilte Ressourcen
+        self.flat_indexes = {}
+        self.fa_index = None
+        self.worker = None
+        self.executor = None
+
+    def make_builder(self, entry):
+        """POISpriteBuilder für ein Set (Build-Dir unter build_root/sets/<name>)"""
+        name = entry["name"]
+        options = {key: value for key, value in entry.items() if key not in SET_KEYS}
+        options.setdefault("output_dir", str(self.build_root / "output" / name))
+        # Ein Raster-Cache für alle Sets
+        options.setdefault("raster_cache_dir", str(self.build_root / "raster_cache"))
+        if "ratios" in entry:
+            options["pixel_ratios"] = [parse_ratio(str(r)) for r in entry["ratios"]]
+
+        builder = POISpriteBuilder(
+            build_dir=entry.get("build_dir", self.build_root / "sets" / name),
+            sprite_name=name,
+            force=self.force or options.pop("force", False),
+            jobs=self.jobs,
+            fa_dir=self.build_root / "fontawesome",
+            mapping_file=entry.get("mapping"),
+            **options,
+        )
+        builder.icon_index = self.icon_index_for(entry, builder)
+        if "mapping" not in entry:
+            # Ohne Mapping: jedes Icon der Quelle unter eigenem Namen
+            builder.mapping = {icon: icon for icon in sorted(builder.icon_index.names())}
+        if "mapping" not in entry or entry.get("icons", "fontawesome") != "fontawesome":
+            builder.registry_mapping = False
+        builder.executor = self.executor
+        if self.worker is not None and builder.backend == "docker":
+            builder.worker = self.worker
+            builder.owns_worker = False
+        return builder
+
+    def icon_index_for(self, entry, builder):
+        icons = entry.get("icons", "fontawesome")
+        if icons != "fontawesome":
+            if icons not in self.flat_indexes:
+                if not Path(icons).is_dir():
+                    raise ValueError(f"Set {entry['name']}: Icon-Verzeichnis {icons} nicht gefunden")
+                try:
+                    self.flat_indexes[icons] = IconIndex.scan_flat(icons)
+                except OSError as e:
+                    raise ValueError(f"Set {entry['name']}: Icon-Verzeichnis {icons} nicht lesbar: {e}")
+            return self.flat_indexes[icons]
+        if self.fa_index is None:
+            # Einmaliger Font Awesome Download für alle Sets
+            builder.setup_directories()
+            if not builder.download_fontawesome():
+                raise RuntimeError("Font Awesome nicht verfügbar")
+            self.fa_index = builder.load_icon_index()
+        return self.fa_index
+
+    def start_shared_worker(self, builders):
+        """Ein spreet-Container für alle Docker-Sets"""
+        docker_builders = [b for b in builders if b.backend == "docker" and not b.spreet_bin]
+        if not any(b.warm_worker for b in docker_builders):
+            return
+        mounts = {self.build_root: "/build"}
+        for i, builder in enumerate(docker_builders):
+            if not builder.atomic_publish:
+                mounts[builder.output_dir] = f"/output/{i}"
+            if self.build_root not in builder.build_dir.absolute().parents:
+                mounts[builder.build_dir] = f"/sets/{i}"
+        self.worker = SpreetWorker(docker_builders[0].docker_image, mounts)
+        try:
+            for builder in docker_builders:
+                builder.setup_directories()
+            started = self.worker.start()
+            print_success(f"spreet-Worker {'gestartet' if started else 'übernommen'}: {self.worker.name}")
+        except SpreetWorkerError as e:
+            print_warning(f"Worker-Start fehlgeschlagen, verwende docker run: {e}")
+            self.worker = None
+            return
+        for builder in docker_builders:
+            builder.worker = self.worker
+            builder.owns_worker = False
+
+    def build_set(self, builder):
+        try:
+            builder.run()
+        except SystemExit:
+            pass
+        return builder.profiler.success
+
+    def run(self):
+        print_header(f"Batch-Build: {len(self.sets)} Sprite-Sets")
+
+        if any(entry.get("backend") == "native" for entry in self.sets):
+            self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+
+        failed = []
+        try:
+            builders = []
+            for entry in self.sets:
+                try:
+                    builders.append(self.make_builder(entry))
+                except (RuntimeError, ValueError) as e:
+                    # Nur dieses Set fällt aus, die übrigen werden gebaut
+                    print_warning(str(e))
+                    failed.append(entry["name"])
+            self.start_shared_worker(builders)
+
+            with ThreadPoolExecutor(max_workers=max(1, len(builders))) as pool:
+                results = list(pool.map(self.build_set, builders))
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+            if self.worker is not None and not self.keep_worker:
+                self.worker.stop()
+
+        print_header("Batch-Ergebnis")
+        for builder, ok in zip(builders, results):
+            if ok:
+                print_success(f"{builder.sprite_name:20} → {builder.output_dir}")
+            else:
+                print_warning(f"{builder.sprite_name:20} fehlgeschlagen")
+        for name in failed:
+            print_warning(f"{name:20} nicht gestartet")
+        return all(results) and not failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build several sprite sets from one config file.",
+        epilog=f"Beispiel-Konfiguration:\n{EXAMPLE_CONFIG}",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("config", help="JSON-Konfiguration mit build_dir, defaults und sets")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Größe des gemeinsamen Worker-Pools (Standard: alle Kerne)")
+    parser.add_argument("--force", action="store_true", help="Alle Sets vollständig neu bauen")
+    parser.add_argument("--keep-worker", action="store_true",
+                        help="Gemeinsamen spreet-Container nach dem Lauf weiterlaufen lassen")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    batch = SpriteSetBatch(config, jobs=args.jobs, force=args.force, keep_worker=args.keep_worker)
+    sys.exit(0 if batch.run() else 1)
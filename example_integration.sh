@@ -22,30 +22,20 @@ echo "--- Erstelle POI-Sprites... ---"
 
 POI_SPRITE_DIR="$ASSETS_DIR/sprites/poi"
 
-# Prüfe ob POI-Sprites bereits existieren
-if [ -f "$POI_SPRITE_DIR/poi.png" ] && [ -f "$POI_SPRITE_DIR/poi.json" ]; then
-    echo "✓ POI-Sprites bereits vorhanden, überspringe..."
-    
-    # Optional: Prüfe Alter der Sprites (z.B. älter als 7 Tage?)
-    if [ -n "$(find "$POI_SPRITE_DIR/poi.png" -mtime +7 2>/dev/null)" ]; then
-        echo "⚠ Sprites sind älter als 7 Tage, aktualisiere..."
-        "$INSTALL_DIR/build_poi_sprites.sh" || {
+# Der Builder arbeitet inkrementell (build_manifest.json im Build-Dir):
+# Unveränderte Stufen werden übersprungen, daher bei jedem Lauf aufrufen.
+if [ -x "$INSTALL_DIR/build_poi_sprites.sh" ]; then
+    "$INSTALL_DIR/build_poi_sprites.sh" || {
+        if [ -f "$POI_SPRITE_DIR/poi.png" ] && [ -f "$POI_SPRITE_DIR/poi.json" ]; then
             echo "⚠ POI-Sprite Update fehlgeschlagen, verwende alte Version"
-        }
-    fi
-else
-    echo "→ Erstelle POI-Sprites zum ersten Mal..."
-    
-    # Führe POI Sprite Builder aus
-    if [ -x "$INSTALL_DIR/build_poi_sprites.sh" ]; then
-        "$INSTALL_DIR/build_poi_sprites.sh" || {
+        else
             echo "✗ POI-Sprite Erstellung fehlgeschlagen"
             echo "  Fahre fort ohne POI-Sprites..."
-        }
-    else
-        echo "⚠ build_poi_sprites.sh nicht gefunden oder nicht ausführbar"
-        echo "  Installiere zuerst: cp build_poi_sprites.sh /srv/scripts/"
-    fi
+        fi
+    }
+else
+    echo "⚠ build_poi_sprites.sh nicht gefunden oder nicht ausführbar"
+    echo "  Installiere zuerst: cp build_poi_sprites.sh /srv/scripts/"
 fi
 
 # ==========================================
@@ -0,0 +1,145 @@
+"""Beschaffung des Font Awesome Free Archivs.
+
+Das Archiv wird gestreamt in einen gemeinsamen Cache geladen (ein Zip je
+Version), per SHA-256 geprüft und nur mit den ``svgs/``-Einträgen
+entpackt. Ohne bekannte Prüfsumme wird der Hash beim ersten Download
+gespeichert und bei jeder weiteren Verwendung verifiziert.
+"""
+
+import hashlib
+import os
+import shutil
+import urllib.request
+import zipfile
+from pathlib import Path
+
+FA_VERSION = "6.5.1"
+FA_URL = "https://github.com/FortAwesome/Font-Awesome/releases/download/{version}/fontawesome-free-{version}-web.zip"
+
+DEFAULT_CACHE_DIR = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "poi-sprite-generator"
+
+CHUNK_SIZE = 1 << 16
+
+
+class FontAwesomeError(Exception):
+    """Archiv nicht verfügbar oder Prüfsumme falsch"""
+
+
+def archive_url(version):
+    return FA_URL.format(version=version)
+
+
+def cached_archive(cache_dir, version):
+    return Path(cache_dir) / f"fontawesome-free-{version}-web.zip"
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _checksum_file(archive):
+    return archive.with_name(archive.name + ".sha256")
+
+
+def verify(archive, expected_sha256=None):
+    """Prüfe das Archiv gegen die erwartete bzw. gespeicherte Prüfsumme"""
+    archive = Path(archive)
+    checksum_file = _checksum_file(archive)
+    if expected_sha256 is None and checksum_file.exists():
+        expected_sha256 = checksum_file.read_text().split()[0]
+    actual = sha256_file(archive)
+    if expected_sha256 and actual != expected_sha256.lower():
+        raise FontAwesomeError(f"Prüfsumme falsch für {archive.name}: {actual} != {expected_sha256}")
+    return actual
+
+
+def download(url, dest, expected_sha256=None):
+    """Lade url gestreamt nach dest und prüfe den Hash vor dem Umbenennen"""
+    dest = Path(dest)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.part")
+    digest = hashlib.sha256()
+    try:
+        with urllib.request.urlopen(url) as response, open(tmp, 'wb') as f:
+            for chunk in iter(lambda: response.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                f.write(chunk)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+    actual = digest.hexdigest()
+    if expected_sha256 and actual != expected_sha256.lower():
+        tmp.unlink()
+        raise FontAwesomeError(f"Prüfsumme falsch für {url}: {actual} != {expected_sha256}")
+    os.replace(tmp, dest)
+    _checksum_file(dest).write_text(f"{actual}  {dest.name}\n")
+    return actual
+
+
+def fetch_archive(version=FA_VERSION, cache_dir=DEFAULT_CACHE_DIR, expected_sha256=None,
+                  offline=False):
+    """Liefert den Pfad eines verifizierten Archivs (aus dem Cache oder neu geladen)"""
+    archive = cached_archive(cache_dir, version)
+    if archive.exists():
+        verify(archive, expected_sha256)
+        return archive
+    if offline:
+        raise FontAwesomeError(f"Offline-Modus: {archive} nicht im Cache")
+    download(archive_url(version), archive, expected_sha256)
+    return archive
+
+
+def extraction_stamp(dest):
+    """Prüfsumme des entpackten Archivs, neben (nicht in) dest"""
+    dest = Path(dest)
+    return dest.with_name(f"{dest.name}.sha256")
+
+
+def extracted_digest(dest):
+    """SHA-256 des Archivs, aus dem dest entpackt wurde (None wenn unbekannt)"""
+    try:
+        return extraction_stamp(dest).read_text().split()[0]
+    except (OSError, IndexError):
+        return None
+
+
+def extract_svgs(archive, dest, digest=None):
+    """Entpacke nur die SVG-Einträge unter ``svgs/``, liefert deren Anzahl.
+
+    Entpackt wird in ein temporäres Verzeichnis, das dann gegen dest
+    getauscht wird: bestehende Dateien (z.B. per Hardlink gestagt) werden
+    nie in-place überschrieben. ``digest`` wird als Stempel abgelegt.
+    """
+    dest = Path(dest).resolve()
+    tmp = dest.with_name(f".{dest.name}.extract")
+    old = dest.with_name(f".{dest.name}.old")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    extraction_stamp(dest).unlink(missing_ok=True)
+    extracted = 0
+    with zipfile.ZipFile(archive) as zip_ref:
+        for info in zip_ref.infolist():
+            parts = info.filename.split('/')
+            if info.is_dir() or 'svgs' not in parts[:-1] or not info.filename.endswith('.svg'):
+                continue
+            target = (tmp / info.filename).resolve()
+            # Schutz vor "../" in Eintragsnamen
+            if tmp not in target.parents:
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zip_ref.open(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            extracted += 1
+
+    shutil.rmtree(old, ignore_errors=True)
+    if dest.exists():
+        os.rename(dest, old)
+    os.rename(tmp, dest)
+    shutil.rmtree(old, ignore_errors=True)
+    if digest:
+        extraction_stamp(dest).write_text(f"{digest}  {Path(archive).name}\n")
+    return extracted
@@ -0,0 +1,135 @@
+"""Content-gehashte Sprite-Artefakte für CDN-Auslieferung.
+
+Alle Varianten eines Builds (``poi.png``, ``poi@2x.json``, ...) erhalten
+einen gemeinsamen Hash im Namen (``poi.<hash>.png``), damit Clients nie
+altes JSON mit neuem PNG mischen. Das JSON wird zusätzlich gzip- bzw.
+brotli-komprimiert abgelegt. ``<sprite>.manifest.json`` zeigt auf den
+aktuellen Hash und wird atomar ersetzt.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+HASH_LENGTH = 12
+
+
+def content_hash(paths):
+    """Gemeinsamer Hash über alle Dateien (Reihenfolge nach Name)"""
+    digest = hashlib.sha256()
+    for path in sorted(paths, key=lambda p: Path(p).name):
+        digest.update(Path(path).name.encode('utf-8'))
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def manifest_path(output_dir, sprite_name):
+    return Path(output_dir) / f"{sprite_name}.manifest.json"
+
+
+def load_manifest(output_dir, sprite_name):
+    try:
+        with open(manifest_path(output_dir, sprite_name), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_atomic(path, data):
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def precompress(path):
+    """Lege ``.gz`` (und ``.br`` falls verfügbar) neben path ab"""
+    data = Path(path).read_bytes()
+    written = []
+    gz_path = Path(f"{path}.gz")
+    # mtime=0 für reproduzierbare Ausgabe
+    write_atomic(gz_path, gzip.compress(data, compresslevel=9, mtime=0))
+    written.append(gz_path.name)
+    if brotli is not None:
+        br_path = Path(f"{path}.br")
+        write_atomic(br_path, brotli.compress(data, quality=11))
+        written.append(br_path.name)
+    return written
+
+
+def hashed_name(file_name, sprite_name, digest):
+    """``poi@2x.png`` → ``poi.<hash>@2x.png``"""
+    return f"{sprite_name}.{digest}{file_name[len(sprite_name):]}"
+
+
+def artifact_pattern(sprite_name):
+    """Regex für gehashte Artefakte, Gruppe 1 ist der Hash"""
+    return re.compile(
+        rf"^{re.escape(sprite_name)}\.([0-9a-f]{{{HASH_LENGTH}}})(@[0-9.]+x)?\.(png|json)(\.gz|\.br)?$"
+    )
+
+
+def is_artifact(name, sprite_name):
+    """True für gehashte Artefakte und das Manifest (werden nie in-place geändert)"""
+    return (name == manifest_path(".", sprite_name).name
+            or artifact_pattern(sprite_name).match(name) is not None)
+
+
+def prune(output_dir, sprite_name, keep_hashes):
+    """Entferne gehashte Artefakte, deren Hash nicht mehr referenziert ist"""
+    pattern = artifact_pattern(sprite_name)
+    removed = 0
+    for entry in os.scandir(output_dir):
+        match = pattern.match(entry.name)
+        if match and match.group(1) not in keep_hashes:
+            os.unlink(entry.path)
+            removed += 1
+    return removed
+
+
+def publish_hashed(output_dir, sprite_name, file_names, keep=2):
+    """Erzeuge gehashte Kopien und schalte das Manifest atomar um.
+
+    ``file_names`` sind die unveränderten Ausgabedateien (z.B. ``poi.png``).
+    Liefert das neue Manifest.
+    """
+    output_dir = Path(output_dir)
+    paths = [output_dir / name for name in file_names]
+    digest = content_hash(paths)
+
+    files = []
+    for path in paths:
+        target = output_dir / hashed_name(path.name, sprite_name, digest)
+        if not target.exists():
+            tmp = target.with_name(f".{target.name}.tmp")
+            shutil.copy2(path, tmp)
+            os.replace(tmp, target)
+        files.append(target.name)
+        if target.suffix == ".json":
+            files.extend(precompress(target))
+
+    previous = load_manifest(output_dir, sprite_name)
+    history = [digest] + [h for h in previous.get("history", []) if h != digest]
+    history = history[:max(keep, 1)]
+
+    manifest = {
+        "sprite": f"{sprite_name}.{digest}",
+        "hash": digest,
+        "files": sorted(files),
+        "history": history,
+    }
+    # Erst alle Dateien, dann das Manifest: Clients sehen nie einen halben Stand
+    write_atomic(manifest_path(output_dir, sprite_name),
+                 json.dumps(manifest, indent=2).encode('utf-8'))
+    prune(output_dir, sprite_name, set(history))
+    return manifest
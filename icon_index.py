@@ -0,0 +1,231 @@
+"""Icon-Index für Font Awesome SVGs.
+
+Ein einziger Scan über alle ``svgs``-Verzeichnisse unter dem Font Awesome
+Download erzeugt ein Dict Icon-Name → Pfad (mit Stil-Priorität). Der Index
+wird neben dem Download als ``<fa_dir>_index.json`` gespeichert (außerhalb
+von fa_dir, damit das Schreiben den Fingerprint nicht verändert) und nur
+neu aufgebaut, wenn sich die Verzeichnisse ändern.
+"""
+
+import json
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+
+from build_manifest import hash_file
+
+INDEX_VERSION = 1
+
+# Bevorzugte Stile, alle anderen Stil-Verzeichnisse folgen alphabetisch
+STYLE_PRIORITY = ('solid', 'regular', 'brands')
+
+
+def find_svgs_roots(fa_dir, max_depth=3):
+    """Finde alle ``svgs``-Verzeichnisse bis ``max_depth`` Ebenen unter fa_dir"""
+    fa_dir = Path(fa_dir)
+    roots = []
+    level = [fa_dir]
+    for _ in range(max_depth):
+        next_level = []
+        for directory in level:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                if entry.name == 'svgs':
+                    roots.append(Path(entry.path))
+                else:
+                    next_level.append(Path(entry.path))
+        level = next_level
+    return roots
+
+
+def style_rank(style):
+    if style in STYLE_PRIORITY:
+        return (STYLE_PRIORITY.index(style), style)
+    return (len(STYLE_PRIORITY), style)
+
+
+def index_path(fa_dir):
+    fa_dir = Path(fa_dir)
+    return fa_dir.with_name(f"{fa_dir.name}_index.json")
+
+
+def _mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class IconIndex:
+    """Icon-Name → (Pfad, Stil) für alle installierten Icon-Packs"""
+
+    def __init__(self, fa_dir, icons=None, fingerprint=None):
+        self.fa_dir = Path(fa_dir)
+        self.icons = icons or {}
+        self.fingerprint = fingerprint or {}
+
+    @property
+    def index_file(self):
+        return index_path(self.fa_dir)
+
+    def __len__(self):
+        return len(self.icons)
+
+    def __contains__(self, icon_name):
+        return icon_name in self.icons
+
+    def lookup(self, icon_name):
+        """Liefert (Pfad, Stil) oder None"""
+        entry = self.icons.get(icon_name)
+        if entry is None:
+            return None
+        rel_path, style = entry
+        return self.fa_dir / rel_path, style
+
+    def names(self):
+        return self.icons.keys()
+
+    def read_bytes(self, location):
+        return Path(location).read_bytes()
+
+    def content_key(self, location):
+        """Inhalts-Schlüssel einer Quelle (für das Build-Manifest)"""
+        return hash_file(location)
+
+    @classmethod
+    def scan(cls, fa_dir):
+        """Baue den Index in einem Durchlauf auf"""
+        fa_dir = Path(fa_dir)
+        roots = find_svgs_roots(fa_dir)
+        fingerprint = {str(fa_dir): _mtime_ns(fa_dir)}
+        ranked = {}
+
+        # Frühere Roots (alphabetisch) gewinnen bei gleichem Stil
+        for root_rank, root in enumerate(roots):
+            fingerprint[str(root)] = _mtime_ns(root)
+            for style_entry in os.scandir(root):
+                if not style_entry.is_dir():
+                    continue
+                style = style_entry.name
+                fingerprint[style_entry.path] = _mtime_ns(style_entry.path)
+                rank = (style_rank(style), root_rank)
+                for svg_entry in os.scandir(style_entry.path):
+                    name = svg_entry.name
+                    if not name.endswith('.svg') or not svg_entry.is_file():
+                        continue
+                    icon_name = name[:-4]
+                    current = ranked.get(icon_name)
+                    if current is None or rank < current[0]:
+                        rel_path = os.path.relpath(svg_entry.path, fa_dir)
+                        ranked[icon_name] = (rank, rel_path, style)
+
+        icons = {name: (rel_path, style) for name, (_, rel_path, style) in ranked.items()}
+        return cls(fa_dir, icons, fingerprint)
+
+    @classmethod
+    def scan_flat(cls, directory):
+        """Index für ein flaches Icon-Verzeichnis (z.B. Maki: ``icons/*.svg``)"""
+        directory = Path(directory)
+        icons = {
+            entry.name[:-4]: (entry.name, "flat")
+            for entry in os.scandir(directory)
+            if entry.name.endswith('.svg') and entry.is_file()
+        }
+        return cls(directory, icons, {str(directory): _mtime_ns(directory)})
+
+    def is_current(self):
+        """True wenn sich keines der indizierten Verzeichnisse geändert hat"""
+        if not self.fingerprint:
+            return False
+        return all(_mtime_ns(path) == mtime for path, mtime in self.fingerprint.items())
+
+    def save(self):
+        tmp_path = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "fingerprint": self.fingerprint,
+                "icons": self.icons,
+            }, f, separators=(',', ':'), sort_keys=True)
+        tmp_path.replace(self.index_file)
+
+    @classmethod
+    def load(cls, fa_dir):
+        index_file = index_path(fa_dir)
+        try:
+            with open(index_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != INDEX_VERSION:
+            return None
+        icons = {name: tuple(entry) for name, entry in data.get("icons", {}).items()}
+        return cls(fa_dir, icons, data.get("fingerprint"))
+
+    @classmethod
+    def load_or_build(cls, fa_dir):
+        """Lade gespeicherten Index oder baue ihn neu auf"""
+        index = cls.load(fa_dir)
+        if index is not None and index.is_current():
+            return index
+        index = cls.scan(fa_dir)
+        if Path(fa_dir).exists():
+            index.save()
+        return index
+
+
+class ZipIconIndex:
+    """Icon-Quelle direkt aus dem Font Awesome Zip (ohne Entpacken).
+
+    Das zentrale Verzeichnis des Archivs dient als Index; SVG-Bytes werden
+    bei Bedarf per Offset aus dem Archiv gelesen.
+    """
+
+    def __init__(self, archive):
+        self.archive = Path(archive)
+        self._zip = zipfile.ZipFile(self.archive)
+        self.icons = self._scan()
+
+    def _scan(self):
+        ranked = {}
+        for info in self._zip.infolist():
+            path = PurePosixPath(info.filename)
+            if info.is_dir() or path.suffix != '.svg' or len(path.parts) < 3:
+                continue
+            if path.parts[-3] != 'svgs':
+                continue
+            style = path.parts[-2]
+            # Root-Reihenfolge wie beim Verzeichnis-Index: alphabetisch
+            rank = (style_rank(style), str(path.parents[1]))
+            current = ranked.get(path.stem)
+            if current is None or rank < current[0]:
+                ranked[path.stem] = (rank, info, style)
+        return {name: (info, style) for name, (_, info, style) in ranked.items()}
+
+    def __len__(self):
+        return len(self.icons)
+
+    def __contains__(self, icon_name):
+        return icon_name in self.icons
+
+    def lookup(self, icon_name):
+        """Liefert (ZipInfo, Stil) oder None"""
+        return self.icons.get(icon_name)
+
+    def names(self):
+        return self.icons.keys()
+
+    def read_bytes(self, location):
+        return self._zip.read(location)
+
+    def content_key(self, location):
+        # CRC32 + Größe aus dem zentralen Verzeichnis, ohne zu dekomprimieren
+        return f"crc32:{location.CRC:08x}:{location.file_size}"
+
+    def close(self):
+        self._zip.close()
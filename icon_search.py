@@ -0,0 +1,109 @@
+"""Unscharfe Suche passender Font-Awesome-Icons für POI-Typen.
+
+Grundlage ist ``metadata/icons.json`` aus dem Font-Awesome-Archiv
+(Icon-Namen, Aliase, Label und Suchbegriffe); ohne Metadaten werden nur
+die Icon-Namen verwendet. Die Suche läuft über einen invertierten
+Token-Index, sodass auch hunderte POI-Typen in Bruchteilen einer Sekunde
+bewertet sind.
+"""
+
+import difflib
+import json
+import re
+import zipfile
+
+# Gewichte je Herkunft eines Tokens: der Icon-Name zählt am meisten
+FIELD_WEIGHTS = {"name": 1.0, "alias": 0.95, "label": 0.9, "term": 0.8}
+
+# Ähnlichkeit, ab der ein Token als Tippfehler/Wortform gilt (z.B. "theatre"/"theater")
+CLOSE_MATCH_CUTOFF = 0.75
+
+_SPLIT = re.compile(r"[^a-z0-9]+")
+
+
+def tokenize(text):
+    return [token for token in _SPLIT.split(text.lower()) if token]
+
+
+def load_metadata(archive):
+    """Icon-Metadaten aus dem Zip: {Name: {"styles", "aliases", "label", "terms"}}"""
+    with zipfile.ZipFile(archive) as zip_ref:
+        member = next((name for name in zip_ref.namelist()
+                       if name.endswith("metadata/icons.json")), None)
+        if member is None:
+            return {}
+        raw = json.loads(zip_ref.read(member))
+
+    metadata = {}
+    for name, entry in raw.items():
+        metadata[name] = {
+            "styles": entry.get("free", []),
+            "aliases": (entry.get("aliases") or {}).get("names", []),
+            "label": entry.get("label", ""),
+            "terms": (entry.get("search") or {}).get("terms", []),
+        }
+    return metadata
+
+
+class IconMatcher:
+    def __init__(self, icon_names, metadata=None):
+        """``icon_names``: verfügbare Icons, ``metadata`` wie von load_metadata()"""
+        metadata = metadata or {}
+        # Token → {Icon: Gewicht}
+        self.index = {}
+        self.name_tokens = {}
+        for icon in icon_names:
+            entry = metadata.get(icon, {})
+            self.name_tokens[icon] = tokenize(icon)
+            fields = [("name", icon)]
+            fields += [("alias", alias) for alias in entry.get("aliases", [])]
+            fields += [("label", entry.get("label", ""))]
+            fields += [("term", term) for term in entry.get("terms", [])]
+            for field, text in fields:
+                for token in tokenize(text):
+                    weights = self.index.setdefault(token, {})
+                    weights[icon] = max(weights.get(icon, 0.0), FIELD_WEIGHTS[field])
+        self.vocabulary = list(self.index)
+        self._close = {}
+
+    def __len__(self):
+        return len(self.name_tokens)
+
+    def close_tokens(self, token):
+        """Vokabular-Tokens ähnlich zu token mit ihrer Ähnlichkeit"""
+        if token not in self._close:
+            matches = {}
+            if token in self.index:
+                matches[token] = 1.0
+            for candidate in difflib.get_close_matches(token, self.vocabulary, n=5,
+                                                       cutoff=CLOSE_MATCH_CUTOFF):
+                matches.setdefault(candidate,
+                                   difflib.SequenceMatcher(None, token, candidate).ratio())
+            self._close[token] = matches
+        return self._close[token]
+
+    def suggest(self, poi_type, limit=3):
+        """Beste Icons für einen POI-Typ als Liste (Icon, Score in [0, 1])"""
+        tokens = tokenize(poi_type)
+        if not tokens:
+            return []
+
+        # Je Icon und POI-Token die beste Übereinstimmung
+        per_icon = {}
+        for position, token in enumerate(tokens):
+            for candidate, similarity in self.close_tokens(token).items():
+                for icon, weight in self.index[candidate].items():
+                    best = per_icon.setdefault(icon, [0.0] * len(tokens))
+                    best[position] = max(best[position], similarity * weight)
+
+        scored = []
+        for icon, best in per_icon.items():
+            coverage = sum(best) / len(tokens)
+            # Kurze, genau passende Namen vor längeren Varianten ("tooth" vor "tooth-brush")
+            name_tokens = self.name_tokens[icon]
+            extra = len(set(name_tokens) - set(tokens)) / len(name_tokens)
+            score = coverage * (1.0 - 0.15 * extra)
+            scored.append((round(score, 3), icon))
+
+        scored.sort(key=lambda item: (-item[0], len(item[1]), item[1]))
+        return [(icon, score) for score, icon in scored[:limit]]
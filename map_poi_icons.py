@@ -7,9 +7,16 @@ Erstellt oder aktualisiert das POI → Font Awesome Mapping.
 import argparse
 import json
 import os
+import sys
 from pathlib import Path
 
-from poi_mapping import AUTO_MAPPINGS, ALL_POI_TYPES
+import fontawesome
+from icon_index import IconIndex, ZipIconIndex
+from icon_search import IconMatcher, load_metadata
+from mapping_store import MappingStore
+from poi_histogram import coverage, frequency_order, load_histogram
+from poi_mapping import AUTO_MAPPINGS
+from poi_registry import REGISTRY
 
 
 class Colors:
@@ -42,81 +49,239 @@ def print_info(text):
 
 
 class POIIconMapper:
-    def __init__(self, build_dir="/srv/build/poi-sprites"):
+    def __init__(self, build_dir="/srv/build/poi-sprites", batch=False, min_score=0.6,
+                 fa_version=fontawesome.FA_VERSION, fa_cache_dir=fontawesome.DEFAULT_CACHE_DIR,
+                 fa_zip=None, offline=False, histogram=None):
         self.build_dir = Path(build_dir)
         self.mapping_file = self.build_dir / "poi_mapping.json"
+        self.suggestions_file = self.build_dir / "poi_mapping_suggestions.json"
+        self.store = MappingStore(self.mapping_file)
         self.mapping = {}
+        # Batch: Vorschläge ab min_score übernehmen, keine Rückfragen
+        self.batch = batch
+        self.min_score = min_score
+        self.fa_version = fa_version
+        self.fa_cache_dir = Path(fa_cache_dir)
+        self.fa_zip = Path(fa_zip) if fa_zip else None
+        self.offline = offline
+        # Klassenhäufigkeit aus PMTiles (poi_histogram.py), None ohne Histogramm
+        self.histogram = Path(histogram) if histogram else None
+        self.classes = {}
 
     def setup_directory(self):
         self.build_dir.mkdir(parents=True, exist_ok=True)
         print_success(f"Build-Verzeichnis bereit: {self.build_dir}")
 
     def load_existing_mapping(self):
-        if self.mapping_file.exists():
-            with open(self.mapping_file, "r") as f:
-                self.mapping = json.load(f)
+        if self.store.exists():
+            # Enthält auch Zuordnungen eines abgebrochenen Laufs aus dem Journal
+            self.mapping = self.store.load()
             print_success(f"Existierendes Mapping geladen: {len(self.mapping)} Einträge")
         else:
             print_info("Kein existierendes Mapping gefunden, starte neu")
 
+    def assign(self, changes):
+        """Übernimm Zuordnungen und schreibe sie sofort ins Journal"""
+        self.mapping.update(changes)
+        self.store.record(changes)
+
     def save_mapping(self):
-        with open(self.mapping_file, "w") as f:
-            json.dump(self.mapping, f, indent=2, ensure_ascii=False)
+        # Journal atomar ins JSON übernehmen
+        self.mapping = self.store.compact()
         print_success(f"Mapping gespeichert: {self.mapping_file}")
 
+    def load_classes(self):
+        """Klasse → Anzahl aus dem PMTiles-Histogramm"""
+        if self.histogram is None:
+            return
+        try:
+            self.classes = load_histogram(self.histogram)
+        except (OSError, ValueError, KeyError) as e:
+            print_warning(f"Histogramm nicht lesbar: {e}")
+            return
+        print_success(f"Histogramm geladen: {len(self.classes)} Klassen aus {self.histogram}")
+    
+    def map_archive_classes(self):
+        """Klassen aus dem Archiv ohne Icon: Aliase automatisch, Rest zur Zuordnung"""
+        unmapped = coverage(self.classes, self.mapping)["unmapped"]
+        if not unmapped:
+            return []
+        # Aliase/Fallbacks erhalten das Icon ihres POI-Typs unter eigenem Namen
+        resolved = {name: REGISTRY.resolve_icon(name, self.mapping) for name in unmapped}
+        resolved = {name: icon for name, icon in resolved.items() if icon}
+        for name, icon in resolved.items():
+            print_success(f"{name:30} → {icon} (über {REGISTRY.canonical(name)})")
+        self.assign(resolved)
+        remaining = [name for name in unmapped if name not in resolved]
+        if remaining:
+            unknown = [name for name in remaining if name not in REGISTRY]
+            print_warning(f"{len(remaining)} Klassen aus dem Archiv ohne Icon, "
+                          f"{len(unknown)} davon nicht in der Registry")
+        return remaining
+    
+    def find_archive(self):
+        """Font-Awesome-Archiv für Icon-Namen und Metadaten (None falls nicht verfügbar)"""
+        if self.fa_zip:
+            return self.fa_zip
+        try:
+            return fontawesome.fetch_archive(self.fa_version, self.fa_cache_dir, offline=self.offline)
+        except Exception as e:
+            print_warning(f"Font-Awesome-Archiv nicht verfügbar: {e}")
+            return None
+
+    def load_matcher(self):
+        """Icon-Suche über Namen, Aliase und Suchbegriffe aus den FA-Metadaten"""
+        archive = self.find_archive()
+        if archive is not None:
+            index = ZipIconIndex(archive)
+            names = list(index.names())
+            index.close()
+            metadata = load_metadata(archive)
+        else:
+            # Entpackter Baum aus einem früheren Build, nur Icon-Namen
+            names = list(IconIndex.load_or_build(self.build_dir / "fontawesome").names())
+            metadata = {}
+        if not names:
+            print_warning("Keine Font-Awesome-Icons für Vorschläge gefunden")
+            return None
+        print_info(f"Icon-Suche: {len(names)} Icons, Metadaten für {len(metadata)}")
+        return IconMatcher(names, metadata)
+
+    def suggest_icons(self, poi_types):
+        """Vorschläge je POI-Typ, gespeichert mit Scores in poi_mapping_suggestions.json"""
+        matcher = self.load_matcher()
+        if matcher is None:
+            return {}
+        suggestions = {poi_type: matcher.suggest(poi_type) for poi_type in poi_types}
+        with open(self.suggestions_file, "w") as f:
+            json.dump({poi_type: [{"icon": icon, "score": score} for icon, score in entries]
+                       for poi_type, entries in suggestions.items()},
+                      f, indent=2, ensure_ascii=False)
+        print_success(f"Vorschläge gespeichert: {self.suggestions_file}")
+        return suggestions
+
+    def apply_suggestions(self, unmapped, suggestions):
+        """Batch-Modus: beste Vorschläge ab min_score übernehmen"""
+        accepted = {}
+        for poi_type in unmapped:
+            entries = suggestions.get(poi_type)
+            if entries and entries[0][1] >= self.min_score:
+                icon, score = entries[0]
+                accepted[poi_type] = icon
+                print_success(f"{poi_type:30} → {icon} (Score {score:.2f})")
+            else:
+                best = f", bester Vorschlag: {entries[0][0]} ({entries[0][1]:.2f})" if entries else ""
+                print_warning(f"Übersprungen: {poi_type}{best}")
+        self.assign(accepted)
+
+    def prompt_icons(self, unmapped, suggestions):
+        """Interaktive Zuordnung, Vorschläge per Nummer auswählbar"""
+        print_info("Suche Icons auf: https://fontawesome.com/search?o=r&m=free")
+        print_info("Gib nur den Icon-Namen ein (ohne 'fa-' Präfix)")
+        print_info("Beispiel: Für 'fa-circle' gib nur 'circle' ein")
+        print_info("Oder die Nummer eines Vorschlags")
+        print_info("Drücke ENTER ohne Eingabe um zu überspringen")
+        print()
+
+        for poi_type in unmapped:
+            entries = suggestions.get(poi_type, [])
+            if entries:
+                options = ", ".join(f"{i}) {icon} ({score:.2f})"
+                                    for i, (icon, score) in enumerate(entries, 1))
+                print_info(f"Vorschläge: {options}")
+            icon = input(f"{Colors.OKCYAN}Icon für '{poi_type}': {Colors.ENDC}").strip()
+            if icon.isdigit() and 1 <= int(icon) <= len(entries):
+                icon = entries[int(icon) - 1][0]
+            if icon:
+                self.assign({poi_type: icon})
+                print_success(f"Gespeichert: {poi_type} → {icon}")
+            else:
+                print_warning(f"Übersprungen: {poi_type}")
+
     def create_mapping(self):
         print_header("Erstelle POI → Font Awesome Mapping")
 
-        print_info(f"Insgesamt {len(ALL_POI_TYPES)} POI-Typen zu mappen")
-        print_info(f"Automatisch gemappt: {len([p for p in ALL_POI_TYPES if p in AUTO_MAPPINGS])}")
-        print_info(f"Manuelle Eingabe nötig: {len([p for p in ALL_POI_TYPES if p not in AUTO_MAPPINGS])}")
+        auto_mapped, manual = REGISTRY.coverage(AUTO_MAPPINGS)
+        print_info(f"Insgesamt {len(REGISTRY)} POI-Typen zu mappen")
+        print_info(f"Automatisch gemappt: {len(auto_mapped)}")
+        print_info(f"Manuelle Eingabe nötig: {len(manual)}")
         print()
 
         unmapped = []
+        automatic = {}
 
-        for poi_type in ALL_POI_TYPES:
+        for poi_type in REGISTRY:
             if poi_type in self.mapping:
                 continue
 
             if poi_type in AUTO_MAPPINGS:
-                self.mapping[poi_type] = AUTO_MAPPINGS[poi_type]
+                automatic[poi_type] = AUTO_MAPPINGS[poi_type]
                 print_success(f"{poi_type:30} → {AUTO_MAPPINGS[poi_type]}")
             else:
                 unmapped.append(poi_type)
+        self.assign(automatic)
+
+        if self.classes:
+            # Häufige Klassen zuerst, im Archiv fehlende Typen zuletzt
+            unmapped = frequency_order(unmapped, self.classes)
+            extra = [name for name in self.map_archive_classes() if name not in unmapped]
+            unmapped = frequency_order(unmapped + extra, self.classes)
 
         if unmapped:
             print()
             print_warning(f"{len(unmapped)} POI-Typen benötigen manuelle Zuordnung")
-            print_info("Suche Icons auf: https://fontawesome.com/search?o=r&m=free")
-            print_info("Gib nur den Icon-Namen ein (ohne 'fa-' Präfix)")
-            print_info("Beispiel: Für 'fa-circle' gib nur 'circle' ein")
-            print_info("Drücke ENTER ohne Eingabe um zu überspringen")
+            if self.classes:
+                print_info("Reihenfolge nach Häufigkeit im PMTiles-Archiv")
+            suggestions = self.suggest_icons(unmapped)
             print()
 
-            for poi_type in unmapped:
-                icon = input(f"{Colors.OKCYAN}Icon für '{poi_type}': {Colors.ENDC}").strip()
-                if icon:
-                    self.mapping[poi_type] = icon
-                    print_success(f"Gespeichert: {poi_type} → {icon}")
-                else:
-                    print_warning(f"Übersprungen: {poi_type}")
+            if self.batch:
+                print_info(f"Batch-Modus: übernehme Vorschläge ab Score {self.min_score:.2f}")
+                self.apply_suggestions(unmapped, suggestions)
+            else:
+                self.prompt_icons(unmapped, suggestions)
 
         self.save_mapping()
 
-        mapped_count = len([p for p in ALL_POI_TYPES if p in self.mapping])
+        mapped, _ = REGISTRY.coverage(self.mapping)
         print()
-        print_success(f"Mapping abgeschlossen: {mapped_count}/{len(ALL_POI_TYPES)} POI-Typen gemappt")
+        print_success(f"Mapping abgeschlossen: {len(mapped)}/{len(REGISTRY)} POI-Typen gemappt")
+        if self.classes:
+            covered = sum(count for name, count in self.classes.items() if name in self.mapping)
+            total = sum(self.classes.values()) or 1
+            print_info(f"Abdeckung im Archiv: {covered / total:.1%} der POIs haben ein Icon")
 
     def run(self):
         self.setup_directory()
         self.load_existing_mapping()
+        self.load_classes()
         self.create_mapping()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Create or update POI → Font Awesome mapping.")
     parser.add_argument("--build-dir", default=os.getenv("BUILD_DIR", "/srv/build/poi-sprites"))
+    parser.add_argument("--batch", action="store_true",
+                        help="Keine Rückfragen: Vorschläge ab --min-score übernehmen (Standard ohne TTY)")
+    parser.add_argument("--min-score", type=float, default=float(os.getenv("MIN_SCORE", "0.6")),
+                        help="Mindest-Score für automatisch übernommene Vorschläge")
+    parser.add_argument("--fa-version", default=os.getenv("FA_VERSION", fontawesome.FA_VERSION))
+    parser.add_argument("--fa-cache-dir", default=os.getenv("FA_CACHE_DIR", fontawesome.DEFAULT_CACHE_DIR))
+    parser.add_argument("--fa-zip", default=os.getenv("FA_ZIP"),
+                        help="Lokales Font Awesome Archiv für Icon-Namen und Suchbegriffe")
+    parser.add_argument("--offline", action="store_true", help="Kein Netzwerkzugriff")
+    parser.add_argument("--histogram", default=os.getenv("POI_HISTOGRAM"),
+                        help="poi_histogram.json: Klassen aus dem Archiv mappen, häufige zuerst")
     args = parser.parse_args()
 
-    mapper = POIIconMapper(build_dir=args.build_dir)
+    mapper = POIIconMapper(
+        build_dir=args.build_dir,
+        batch=args.batch or not sys.stdin.isatty(),
+        min_score=args.min_score,
+        fa_version=args.fa_version,
+        fa_cache_dir=args.fa_cache_dir,
+        fa_zip=args.fa_zip,
+        offline=args.offline,
+        histogram=args.histogram,
+    )
     mapper.run()
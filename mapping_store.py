@@ -0,0 +1,107 @@
+"""Gesicherter Zugriff auf ``poi_mapping.json``.
+
+Einzelne Änderungen werden an ein Journal (``poi_mapping.journal``, eine
+JSON-Zeile je Änderung) angehängt und mit fsync festgeschrieben, sodass
+ein abgebrochener Mapping-Lauf nichts verliert. ``compact()`` schreibt
+Mapping plus Journal atomar (temporäre Datei + rename) zurück ins JSON
+und leert das Journal. Alle Zugriffe laufen unter einer Dateisperre
+(``poi_mapping.json.lock``), damit Mapper und Builder sich nicht in die
+Quere kommen.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def diff_mappings(old, new):
+    """POI-Typen, deren Icon neu, geändert oder entfernt ist"""
+    return sorted(poi_type for poi_type in set(old) | set(new)
+                  if old.get(poi_type) != new.get(poi_type))
+
+
+class MappingStore:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(".journal")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+
+    @contextmanager
+    def locked(self, exclusive=True):
+        """Dateisperre für die Dauer des Blocks (ohne fcntl: keine Sperre)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def exists(self):
+        return self.path.exists() or self.journal_path.exists()
+
+    def _read(self):
+        mapping = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                mapping = json.load(f)
+        if self.journal_path.exists():
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # abgeschnittene letzte Zeile nach Absturz
+                    if entry.get("icon") is None:
+                        mapping.pop(entry["poi"], None)
+                    else:
+                        mapping[entry["poi"]] = entry["icon"]
+        return mapping
+
+    def load(self):
+        """Mapping inklusive noch nicht kompaktierter Journal-Einträge"""
+        with self.locked(exclusive=False):
+            return self._read()
+
+    def record(self, changes):
+        """Hänge Änderungen ``{POI-Typ: Icon}`` an (Icon None entfernt den Eintrag)"""
+        if not changes:
+            return
+        now = time.time()
+        lines = "".join(json.dumps({"poi": poi_type, "icon": icon, "ts": now}, ensure_ascii=False) + "\n"
+                        for poi_type, icon in changes.items())
+        with self.locked():
+            with open(self.journal_path, 'a') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _write(self, mapping):
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp, 'w') as f:
+            json.dump(mapping, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.journal_path.unlink(missing_ok=True)
+
+    def compact(self):
+        """Journal ins JSON übernehmen, liefert das Mapping"""
+        with self.locked():
+            mapping = self._read()
+            self._write(mapping)
+            return mapping
+
+    def save(self, mapping):
+        """Ersetze das komplette Mapping atomar"""
+        with self.locked():
+            self._write(mapping)
@@ -0,0 +1,274 @@
+"""Streamender Leser für lokale PMTiles-v3-Archive mit MVT-Kacheln.
+
+Das Archiv wird nie komplett geladen: Header und Root-Directory werden
+gelesen, Leaf-Directories erst beim Durchlaufen und nur, wenn ihr
+Tile-ID-Bereich die gewünschte Zoomstufe berührt. Kacheln werden einzeln
+per ``seek``/``read`` geholt. Zum Dekodieren der Vektorkacheln genügt ein
+minimaler Protobuf-Leser, der nur Layer-Namen, Keys, Values und die Tags
+der Features auswertet (keine Geometrien).
+"""
+
+import struct
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional, nur für brotli-komprimierte Archive
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, nur für zstd-komprimierte Archive
+    zstandard = None
+
+MAGIC = b"PMTiles"
+HEADER_SIZE = 127
+
+COMPRESSION_NONE = 1
+COMPRESSION_GZIP = 2
+COMPRESSION_BROTLI = 3
+COMPRESSION_ZSTD = 4
+
+TILE_TYPE_MVT = 1
+
+HEADER_FIELDS = (
+    "root_offset", "root_length", "metadata_offset", "metadata_length",
+    "leaf_offset", "leaf_length", "data_offset", "data_length",
+    "addressed_tiles", "tile_entries", "tile_contents",
+)
+
+
+class PMTilesError(Exception):
+    """Kein gültiges oder nicht unterstütztes PMTiles-Archiv"""
+
+
+def decompress(data, compression):
+    if compression in (0, COMPRESSION_NONE):  # 0: unbekannt, meist unkomprimiert
+        return bytes(data)
+    if compression == COMPRESSION_GZIP:
+        return zlib.decompress(data, 32 + zlib.MAX_WBITS)
+    if compression == COMPRESSION_BROTLI and brotli is not None:
+        return brotli.decompress(data)
+    if compression == COMPRESSION_ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    names = {COMPRESSION_BROTLI: "brotli", COMPRESSION_ZSTD: "zstandard"}
+    if compression in names:
+        raise PMTilesError(f"Komprimierung benötigt: pip install {names[compression]}")
+    raise PMTilesError(f"Unbekannte Komprimierung {compression}")
+
+
+def read_varint(data, pos):
+    """Protobuf-Varint ab ``pos``, liefert (Wert, neue Position)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def zoom_base(z):
+    """Erste Tile-ID der Zoomstufe z (Hilbert-IDs sind je Zoom fortlaufend)"""
+    return ((1 << (2 * z)) - 1) // 3
+
+
+def parse_header(data):
+    if len(data) < HEADER_SIZE or data[:7] != MAGIC:
+        raise PMTilesError("Kein PMTiles-Archiv")
+    if data[7] != 3:
+        raise PMTilesError(f"PMTiles-Version {data[7]} nicht unterstützt (nur v3)")
+    header = dict(zip(HEADER_FIELDS, struct.unpack_from("<11Q", data, 8)))
+    header["clustered"] = bool(data[96])
+    header["internal_compression"] = data[97]
+    header["tile_compression"] = data[98]
+    header["tile_type"] = data[99]
+    header["min_zoom"] = data[100]
+    header["max_zoom"] = data[101]
+    return header
+
+
+def parse_directory(data):
+    """Directory-Einträge als Liste von (tile_id, run_length, offset, length).
+
+    run_length 0 kennzeichnet ein Leaf-Directory.
+    """
+    count, pos = read_varint(data, 0)
+    tile_ids = []
+    last = 0
+    for _ in range(count):
+        delta, pos = read_varint(data, pos)
+        last += delta
+        tile_ids.append(last)
+    run_lengths = []
+    for _ in range(count):
+        value, pos = read_varint(data, pos)
+        run_lengths.append(value)
+    lengths = []
+    for _ in range(count):
+        value, pos = read_varint(data, pos)
+        lengths.append(value)
+    entries = []
+    for i in range(count):
+        value, pos = read_varint(data, pos)
+        if value == 0 and i > 0:
+            # direkt hinter dem vorherigen Eintrag
+            offset = entries[-1][2] + entries[-1][3]
+        else:
+            offset = value - 1
+        entries.append((tile_ids[i], run_lengths[i], offset, lengths[i]))
+    return entries
+
+
+class PMTilesReader:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.header = parse_header(self.file.read(HEADER_SIZE))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read(self, offset, length):
+        self.file.seek(offset)
+        data = self.file.read(length)
+        if len(data) != length:
+            raise PMTilesError(f"Archiv abgeschnitten bei Offset {offset}")
+        return data
+
+    def _directory(self, offset, length):
+        data = self._read(offset, length)
+        return parse_directory(decompress(data, self.header["internal_compression"]))
+
+    def tile_entries(self, zoom=None):
+        """Kachel-Einträge (tile_id, Anzahl Kacheln, Offset, Länge) in ID-Reihenfolge.
+
+        Mit ``zoom`` nur die Kacheln dieser Zoomstufe; Leaf-Directories
+        außerhalb des Bereichs werden gar nicht erst gelesen. Die Anzahl ist
+        größer als 1 bei Run-Length-Einträgen (identische Kacheln).
+        """
+        low, high = (0, float("inf")) if zoom is None else (zoom_base(zoom), zoom_base(zoom + 1))
+        header = self.header
+        # Stapel statt Rekursion: (Einträge, Position, Ende des Bereichs)
+        stack = [(self._directory(header["root_offset"], header["root_length"]), 0, float("inf"))]
+        while stack:
+            entries, i, end = stack.pop()
+            if i >= len(entries):
+                continue
+            tile_id, run_length, offset, length = entries[i]
+            following = entries[i + 1][0] if i + 1 < len(entries) else end
+            stack.append((entries, i + 1, end))
+            if tile_id >= high:
+                stack.pop()  # IDs sind sortiert, der Rest liegt dahinter
+                continue
+            if run_length == 0:
+                if following > low:
+                    leaf = self._directory(header["leaf_offset"] + offset, length)
+                    stack.append((leaf, 0, following))
+                continue
+            first = max(tile_id, low)
+            last = min(tile_id + run_length, high)
+            if last > first:
+                yield tile_id, last - first, offset, length
+
+    def read_tile(self, offset, length):
+        """Dekomprimierter Inhalt einer Kachel"""
+        data = self._read(self.header["data_offset"] + offset, length)
+        return decompress(data, self.header["tile_compression"])
+
+
+def _fields(data):
+    """(Feldnummer, Wert) eines Protobuf-Messages; Längenfelder als memoryview"""
+    data = memoryview(data)
+    pos = 0
+    end = len(data)
+    while pos < end:
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            value = data[pos:pos + length]
+            pos += length
+        elif wire_type == 1:
+            value = data[pos:pos + 8]
+            pos += 8
+        elif wire_type == 5:
+            value = data[pos:pos + 4]
+            pos += 4
+        else:
+            raise PMTilesError(f"Protobuf-Wiretype {wire_type} nicht unterstützt")
+        yield field, value
+
+
+def _value(data):
+    """Wert eines MVT-Value-Messages (Strings, Zahlen, Bool)"""
+    for field, value in _fields(data):
+        if field == 1:
+            return bytes(value).decode("utf-8", "replace")
+        if field == 2:
+            return struct.unpack("<f", value)[0]
+        if field == 3:
+            return struct.unpack("<d", value)[0]
+        if field in (4, 5):
+            return value
+        if field == 6:
+            return (value >> 1) ^ -(value & 1)
+        if field == 7:
+            return bool(value)
+    return None
+
+
+def _packed(data):
+    data = memoryview(data)
+    pos = 0
+    values = []
+    while pos < len(data):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    return values
+
+
+def layer_values(tile, layer_name, key):
+    """Werte der Eigenschaft ``key`` aller Features eines Layers einer MVT-Kachel"""
+    for field, layer in _fields(tile):
+        if field != 3:
+            continue
+        name = None
+        keys = []
+        values = []
+        features = []
+        for layer_field, value in _fields(layer):
+            if layer_field == 1:
+                name = bytes(value).decode("utf-8", "replace")
+                if name != layer_name:
+                    break
+            elif layer_field == 2:
+                features.append(value)
+            elif layer_field == 3:
+                keys.append(bytes(value).decode("utf-8", "replace"))
+            elif layer_field == 4:
+                values.append(value)
+        if name != layer_name or key not in keys:
+            continue
+        key_index = keys.index(key)
+        decoded = {}
+        for feature in features:
+            for feature_field, value in _fields(feature):
+                if feature_field != 2:
+                    continue
+                tags = _packed(value)
+                for k, v in zip(tags[::2], tags[1::2]):
+                    if k == key_index:
+                        if v not in decoded:
+                            decoded[v] = _value(values[v])
+                        yield decoded[v]
@@ -0,0 +1,151 @@
+"""PNG-Nachbearbeitung für fertige Sprite-Sheets.
+
+``lossless``: verlustfreie Rekompression (oxipng/optipng falls
+installiert, sonst IDAT-Neukomprimierung mit zlib und Entfernen von
+Text-/Zeit-Chunks). ``palette``: zusätzlich exakte Palette über
+``Pillow``, aber nur wenn das Sheet höchstens 256 RGBA-Farben hat (sonst
+bleibt es beim verlustfreien Modus). ``palette-lossy``: bei mehr als 256
+Farben wird quantisiert, Kantenglättung und Alpha können sich ändern.
+"""
+
+import shutil
+import struct
+import subprocess
+import zlib
+from pathlib import Path
+
+try:
+    from PIL import Image
+except ImportError:  # optional
+    Image = None
+
+OPTIMIZE_MODES = ("off", "lossless", "palette", "palette-lossy")
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Metadaten ohne Einfluss auf die Darstellung
+STRIP_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'tIME'}
+
+
+def read_chunks(data):
+    """Zerlege PNG-Bytes in (Typ, Inhalt)-Paare"""
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Keine PNG-Datei")
+    chunks = []
+    offset = len(PNG_SIGNATURE)
+    while offset < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        chunks.append((chunk_type, body))
+        offset += 12 + length
+        if chunk_type == b'IEND':
+            break
+    return chunks
+
+
+def write_chunk(chunk_type, body):
+    crc = zlib.crc32(chunk_type + body) & 0xffffffff
+    return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", crc)
+
+
+def _deflate(raw, strategy):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+    return compressor.compress(raw) + compressor.flush()
+
+
+def recompress(data):
+    """IDAT mit maximaler zlib-Stufe neu komprimieren, Metadaten entfernen"""
+    chunks = read_chunks(data)
+    raw = zlib.decompress(b''.join(body for chunk_type, body in chunks if chunk_type == b'IDAT'))
+    idat = min((_deflate(raw, strategy) for strategy in (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)),
+               key=len)
+
+    output = [PNG_SIGNATURE]
+    idat_written = False
+    for chunk_type, body in chunks:
+        if chunk_type in STRIP_CHUNKS:
+            continue
+        if chunk_type == b'IDAT':
+            if not idat_written:
+                output.append(write_chunk(b'IDAT', idat))
+                idat_written = True
+            continue
+        output.append(write_chunk(chunk_type, body))
+    return b''.join(output)
+
+
+def external_optimizer():
+    """Befehl für ein installiertes PNG-Tool (oder None)"""
+    if shutil.which("oxipng"):
+        return ["oxipng", "-o", "4", "--strip", "safe", "-q"]
+    if shutil.which("optipng"):
+        return ["optipng", "-o2", "-quiet", "-strip", "all"]
+    return None
+
+
+def exact_palette(image, colors):
+    """P-Bild mit genau den Farben von ``image`` (RGBA), Alpha über tRNS"""
+    index = {bytes(color): i for i, (_, color) in enumerate(colors)}
+    raw = image.tobytes()
+    indices = bytes(index[raw[i:i + 4]] for i in range(0, len(raw), 4))
+    palette_image = Image.frombytes("P", image.size, indices)
+    palette_image.putpalette([channel for _, color in colors for channel in color[:3]])
+    palette_image.info["transparency"] = bytes(color[3] for _, color in colors)
+    return palette_image
+
+
+def quantize(path, lossy=False):
+    """Palettenbild als PNG-Bytes.
+
+    Mit höchstens 256 RGBA-Farben exakt, sonst nur mit ``lossy``
+    quantisiert (None, wenn keine verlustfreie Palette möglich ist).
+    """
+    with Image.open(path) as image:
+        image = image.convert("RGBA")
+        colors = image.getcolors(256)
+        if colors:
+            palette_image = exact_palette(image, colors)
+        elif lossy:
+            palette_image = image.quantize(colors=256, method=Image.Quantize.FASTOCTREE,
+                                           dither=Image.Dither.NONE)
+        else:
+            return None
+    tmp = Path(path).with_name(f".{Path(path).name}.quant")
+    palette_image.save(tmp, format="PNG", optimize=True)
+    data = tmp.read_bytes()
+    tmp.unlink()
+    return data
+
+
+def optimize_png(path, mode="lossless"):
+    """Optimiere eine PNG-Datei in-place.
+
+    Liefert ``{"before": Bytes, "after": Bytes}``. Die Datei wird nur
+    ersetzt, wenn das Ergebnis kleiner ist.
+    """
+    path = Path(path)
+    before = path.stat().st_size
+    if mode == "off":
+        return {"before": before, "after": before}
+
+    best = path.read_bytes()
+
+    if mode in ("palette", "palette-lossy") and Image is not None:
+        candidate = quantize(path, lossy=mode == "palette-lossy")
+        if candidate is not None and len(candidate) < len(best):
+            best = candidate
+
+    candidate = recompress(best)
+    if len(candidate) < len(best):
+        best = candidate
+
+    if len(best) < before:
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(best)
+        tmp.replace(path)
+
+    command = external_optimizer()
+    if command:
+        subprocess.run(command + [str(path)], capture_output=True)
+
+    return {"before": before, "after": path.stat().st_size}
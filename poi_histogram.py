@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Häufigkeit der POI-Klassen in einem PMTiles-Archiv.
+
+Läuft Kachel für Kachel durch ein lokales Archiv (siehe
+``pmtiles_reader.py``) und zählt die Werte von ``class`` im Layer ``poi``
+auf einer Zoomstufe (Standard: maximale Zoomstufe des Archivs, dort sind
+alle POIs enthalten). Der Speicherbedarf hängt nur von der Zahl der
+Klassen und einem kleinen Cache für mehrfach referenzierte Kacheln ab,
+nicht von der Archivgröße. Das Ergebnis landet als
+``poi_histogram.json`` im Build-Verzeichnis und wird von
+``map_poi_icons.py --histogram`` (Reihenfolge, ungemappte Klassen) und
+``build_poi_sprites.py --histogram`` (Ausdünnen seltener Icons) gelesen.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, OrderedDict
+from pathlib import Path
+
+from mapping_store import MappingStore
+from pmtiles_reader import TILE_TYPE_MVT, PMTilesError, PMTilesReader, layer_values
+from poi_registry import REGISTRY
+
+HISTOGRAM_FILE = "poi_histogram.json"
+
+# Kacheln, deren Inhalt an mehreren Stellen referenziert wird (z.B. Meer)
+TILE_CACHE_SIZE = 1024
+
+
+def class_histogram(path, layer="poi", field="class", zoom=None, progress=None):
+    """Zähle die Werte von ``field`` im Layer ``layer``.
+
+    ``progress(gelesene_kacheln)`` wird alle 10.000 Kacheln aufgerufen.
+    """
+    start = time.perf_counter()
+    counts = Counter()
+    cache = OrderedDict()
+    tiles = 0
+    decoded = 0
+    with PMTilesReader(path) as reader:
+        header = reader.header
+        if header["tile_type"] != TILE_TYPE_MVT:
+            raise PMTilesError(f"Kacheltyp {header['tile_type']} ist kein MVT")
+        if zoom is None:
+            zoom = header["max_zoom"]
+        for _, repeat, offset, length in reader.tile_entries(zoom):
+            tile_counts = cache.get(offset)
+            if tile_counts is None:
+                tile_counts = Counter(str(value) for value in
+                                      layer_values(reader.read_tile(offset, length), layer, field))
+                decoded += 1
+                cache[offset] = tile_counts
+                if len(cache) > TILE_CACHE_SIZE:
+                    cache.popitem(last=False)
+            else:
+                cache.move_to_end(offset)
+            for name, count in tile_counts.items():
+                counts[name] += count * repeat
+            tiles += repeat
+            if progress and tiles // 10000 != (tiles - repeat) // 10000:
+                progress(tiles)
+    return {
+        "archive": str(path),
+        "layer": layer,
+        "field": field,
+        "zoom": zoom,
+        "tiles": tiles,
+        "decoded_tiles": decoded,
+        "features": sum(counts.values()),
+        "seconds": round(time.perf_counter() - start, 3),
+        "classes": dict(counts.most_common()),
+    }
+
+
+def save_histogram(histogram, path):
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(histogram, indent=2, ensure_ascii=False))
+    tmp.replace(path)
+
+
+def load_histogram(path):
+    """Klasse → Anzahl aus einer gespeicherten Histogramm-Datei"""
+    with open(path, 'r') as f:
+        return json.load(f)["classes"]
+
+
+def coverage(classes, mapping, registry=REGISTRY):
+    """Abgleich der Klassen im Archiv mit Registry und Mapping.
+
+    ``unmapped``: vorkommende Klassen ohne Icon im Mapping (nach Häufigkeit),
+    ``unknown``: davon die Klassen, die die Registry nicht kennt,
+    ``unseen``: POI-Typen der Registry, die im Archiv nicht vorkommen.
+    """
+    ordered = sorted(classes, key=lambda name: (-classes[name], name))
+    return {
+        "unmapped": [name for name in ordered if name not in mapping],
+        "unknown": [name for name in ordered if name not in registry],
+        "unseen": [poi_type for poi_type in registry if poi_type not in classes],
+    }
+
+
+def frequency_order(poi_types, classes):
+    """POI-Typen nach Häufigkeit im Archiv, unbekannte in alter Reihenfolge dahinter"""
+    return sorted(poi_types, key=lambda poi_type: -classes.get(poi_type, 0))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count POI classes in a PMTiles archive.")
+    parser.add_argument("archive", help="Lokales .pmtiles-Archiv")
+    parser.add_argument("--layer", default="poi", help="Source-Layer (Standard: poi)")
+    parser.add_argument("--field", default="class", help="Gezählte Eigenschaft (Standard: class)")
+    parser.add_argument("--zoom", type=int, default=None,
+                        help="Zoomstufe (Standard: maximale Zoomstufe des Archivs)")
+    parser.add_argument("--build-dir", default=os.getenv("BUILD_DIR", "/srv/build/poi-sprites"))
+    parser.add_argument("--output", default=None,
+                        help=f"Ergebnis-JSON (Standard: <build-dir>/{HISTOGRAM_FILE})")
+    parser.add_argument("--top", type=int, default=20, help="Anzahl der ausgegebenen Klassen")
+    args = parser.parse_args()
+
+    try:
+        histogram = class_histogram(args.archive, args.layer, args.field, args.zoom,
+                                    progress=lambda n: print(f"  {n} Kacheln...", file=sys.stderr))
+    except (OSError, PMTilesError) as e:
+        print(f"Archiv nicht lesbar: {e}")
+        sys.exit(1)
+
+    build_dir = Path(args.build_dir)
+    output = Path(args.output) if args.output else build_dir / HISTOGRAM_FILE
+    output.parent.mkdir(parents=True, exist_ok=True)
+    save_histogram(histogram, output)
+
+    classes = histogram["classes"]
+    print(f"{histogram['tiles']} Kacheln (z{histogram['zoom']}), {histogram['features']} Features, "
+          f"{len(classes)} Klassen in {histogram['seconds']:.1f} s → {output}")
+    for name, count in list(classes.items())[:args.top]:
+        print(f"  {name:30} {count:>10}")
+
+    store = MappingStore(build_dir / "poi_mapping.json")
+    mapping = store.load() if store.exists() else {}
+    report = coverage(classes, mapping)
+    if report["unmapped"]:
+        print(f"\n{len(report['unmapped'])} Klassen ohne Icon "
+              f"({len(report['unknown'])} davon nicht in der Registry), "
+              f"zuordnen mit: map_poi_icons.py --histogram {output}")
+        for name in report["unmapped"][:args.top]:
+            marker = "" if name in REGISTRY else "  (unbekannt)"
+            print(f"  {name:30} {classes[name]:>10}{marker}")
+    if report["unseen"]:
+        print(f"\n{len(report['unseen'])} POI-Typen der Registry kommen im Archiv nicht vor")
@@ -1,195 +1,217 @@
 """Shared POI icon mappings and reference list."""
 
-# Automatisches Mapping: POI-Typ -> Font Awesome Icon-Name (ohne fa- Präfix)
+# Automatisches Mapping je Kategorie: POI-Typ -> Font Awesome Icon-Name (ohne fa- Präfix)
+CATEGORY_MAPPINGS = {
+    "gastro": {  # UNTERKUNFT & GASTRO
+        "lodging": "bed",
+        "restaurant": "utensils",
+        "cafe": "coffee",
+        "bar": "wine-glass",
+        "beer": "beer-mug-empty",
+        "biergarten": "beer-mug-empty",
+        "fast_food": "burger",
+        "ice_cream": "ice-cream",
+        "pub": "beer-mug-empty",
+    },
+
+    "shops": {  # EINZELHANDEL & SERVICES
+        "shop": "store",
+        "grocery": "basket-shopping",
+        "bakery": "bread-slice",
+        "butcher": "meat",
+        "alcohol_shop": "wine-bottle",
+        "clothing_store": "shirt",
+        "hairdresser": "scissors",
+        "laundry": "soap",
+    },
+
+    "health": {  # GESUNDHEIT
+        "hospital": "hospital",
+        "doctors": "user-doctor",
+        "pharmacy": "prescription-bottle",
+        "dentist": "tooth",
+        "veterinary": "paw",
+    },
+
+    "education": {  # BILDUNG
+        "school": "school",
+        "college": "graduation-cap",
+        "library": "book",
+        "kindergarten": "child",
+    },
+
+    "public": {  # ÖFFENTLICHE EINRICHTUNGEN
+        "town_hall": "landmark",
+        "post": "envelope",
+        "police": "shield",
+        "fire_station": "fire-extinguisher",
+        "prison": "lock",
+        "office": "building",
+        "community_centre": "users",
+        "public_building": "building-columns",
+    },
+
+    "culture": {  # KULTUR & FREIZEIT
+        "museum": "building-columns",
+        "art_gallery": "palette",
+        "theatre": "masks-theater",
+        "cinema": "film",
+        "castle": "chess-rook",
+        "monument": "monument",
+        "attraction": "star",
+        "theme_park": "ferris-wheel",
+        "zoo": "hippo",
+        "aquarium": "fish",
+        "music": "music",
+        "hackerspace": "laptop-code",
+    },
+
+    "religion": {  # RELIGIÖS
+        "place_of_worship": "place-of-worship",
+    },
+
+    "transport": {  # VERKEHR & INFRASTRUKTUR
+        "parking": "square-parking",
+        "bicycle_parking": "bicycle",
+        "motorcycle_parking": "motorcycle",
+        "fuel": "gas-pump",
+        "bus": "bus",
+        "railway": "train",
+        "aerialway": "cable-car",
+        "ferry_terminal": "ferry",
+        "gate": "door-open",
+        "lift_gate": "bars",
+        "bollard": "road-barrier",
+        "cycle_barrier": "bars",
+        "stile": "stairs",
+        "sally_port": "door-closed",
+        "toll_booth": "money-bill",
+        "border_control": "passport",
+        "entrance": "door-open",
+        "harbor": "anchor",
+    },
+
+    "sport_ball": {  # SPORT & RECREATION - Ball-Sportarten
+        "pitch": "futbol",
+        "stadium": "building",
+        "sports_centre": "dumbbell",
+        "athletics": "person-running",
+        "football": "futbol",
+        "soccer": "futbol",
+        "basketball": "basketball",
+        "volleyball": "volleyball",
+        "beachvolleyball": "volleyball",
+        "tennis": "table-tennis-paddle-ball",
+        "table_tennis": "table-tennis-paddle-ball",
+        "handball": "hand",
+        "team_handball": "hand",
+        "baseball": "baseball",
+        "field_hockey": "hockey-puck",
+        "hockey": "hockey-puck",
+        "rugby_union": "football",
+        "badminton": "shuttle-space",
+    },
+
+    "sport_water": {  # SPORT - Wasser
+        "swimming": "person-swimming",
+        "swimming_pool": "person-swimming",
+        "water_park": "water",
+        "scuba_diving": "water",
+        "water_ski": "person-skiing-nordic",
+        "sailing": "sailboat",
+        "rowing": "water",
+        "canoe": "water",
+        "surfing": "water",
+        "diving": "water",
+    },
+
+    "sport_winter": {  # SPORT - Winter
+        "winter_sports": "snowflake",
+        "ice_hockey": "hockey-puck",
+        "ice_rink": "snowflake",
+        "ice_stock": "snowflake",
+        "curling": "snowflake",
+        "skiing": "person-skiing",
+        "skating": "snowflake",
+        "toboggan": "sleigh",
+    },
+
+    "sport_other": {  # SPORT - Andere
+        "golf": "golf-ball-tee",
+        "disc_golf": "compact-disc",
+        "cycling": "bicycle",
+        "bicycle": "bicycle",
+        "running": "person-running",
+        "climbing": "mountain",
+        "climbing_adventure": "mountain",
+        "archery": "bullseye",
+        "shooting": "bullseye",
+        "shooting_range": "bullseye",
+        "gymnastics": "person-walking",
+        "yoga": "spa",
+        "judo": "hand-fist",
+        "boxing": "hand-fist",
+        "wrestling": "hand-fist",
+        "equestrian": "horse",
+        "horse_racing": "horse",
+        "dog_racing": "dog",
+        "motor": "car",
+        "motocross": "motorcycle",
+        "rc_car": "car",
+        "karting": "car",
+        "skateboard": "person-skateboarding",
+        "bmx": "bicycle",
+        "paragliding": "plane",
+        "free_flying": "plane",
+        "model_aerodrome": "plane",
+        "orienteering": "compass",
+        "paintball": "bullseye",
+        "billiards": "circle",
+        "table_soccer": "futbol",
+        "chess": "chess",
+        "bowls": "bowling-ball",
+        "boules": "circle",
+        "horseshoes": "horse",
+        "racquet": "table-tennis-paddle-ball",
+        "paddle_tennis": "table-tennis-paddle-ball",
+        "long_jump": "person-running",
+    },
+
+    "nature": {  # NATUR & PARKS
+        "park": "tree",
+        "garden": "leaf",
+        "playground": "child",
+        "picnic_site": "utensils",
+        "dog_park": "dog",
+        "campsite": "campground",
+        "basin": "water",
+        "reservoir": "water",
+    },
+
+    "utilities": {  # UTILITIES & SERVICES
+        "atm": "money-bill",
+        "toilets": "restroom",
+        "drinking_water": "faucet-drip",
+        "fountain": "fountain",
+        "waste_basket": "trash-can",
+        "recycling": "recycle",
+        "information": "circle-info",
+        "shelter": "house",
+        "bench": "chair",
+        "telephone": "phone",
+        "car": "car",
+        "multi": "circle",
+    },
+}
+
+# Flaches Mapping über alle Kategorien
 AUTO_MAPPINGS = {
-    # UNTERKUNFT & GASTRO
-    "lodging": "bed",
-    "restaurant": "utensils",
-    "cafe": "coffee",
-    "bar": "wine-glass",
-    "beer": "beer-mug-empty",
-    "biergarten": "beer-mug-empty",
-    "fast_food": "burger",
-    "ice_cream": "ice-cream",
-    "pub": "beer-mug-empty",
-
-    # EINZELHANDEL & SERVICES
-    "shop": "store",
-    "grocery": "basket-shopping",
-    "bakery": "bread-slice",
-    "butcher": "meat",
-    "alcohol_shop": "wine-bottle",
-    "clothing_store": "shirt",
-    "hairdresser": "scissors",
-    "laundry": "soap",
-
-    # GESUNDHEIT
-    "hospital": "hospital",
-    "doctors": "user-doctor",
-    "pharmacy": "prescription-bottle",
-    "dentist": "tooth",
-    "veterinary": "paw",
-
-    # BILDUNG
-    "school": "school",
-    "college": "graduation-cap",
-    "library": "book",
-    "kindergarten": "child",
-
-    # ÖFFENTLICHE EINRICHTUNGEN
-    "town_hall": "landmark",
-    "post": "envelope",
-    "police": "shield",
-    "fire_station": "fire-extinguisher",
-    "prison": "lock",
-    "office": "building",
-    "community_centre": "users",
-    "public_building": "building-columns",
-
-    # KULTUR & FREIZEIT
-    "museum": "building-columns",
-    "art_gallery": "palette",
-    "theatre": "masks-theater",
-    "cinema": "film",
-    "castle": "chess-rook",
-    "monument": "monument",
-    "attraction": "star",
-    "theme_park": "ferris-wheel",
-    "zoo": "hippo",
-    "aquarium": "fish",
-    "music": "music",
-    "hackerspace": "laptop-code",
-
-    # RELIGIÖS
-    "place_of_worship": "place-of-worship",
-
-    # VERKEHR & INFRASTRUKTUR
-    "parking": "square-parking",
-    "bicycle_parking": "bicycle",
-    "motorcycle_parking": "motorcycle",
-    "fuel": "gas-pump",
-    "bus": "bus",
-    "railway": "train",
-    "aerialway": "cable-car",
-    "ferry_terminal": "ferry",
-    "gate": "door-open",
-    "lift_gate": "bars",
-    "bollard": "road-barrier",
-    "cycle_barrier": "bars",
-    "stile": "stairs",
-    "sally_port": "door-closed",
-    "toll_booth": "money-bill",
-    "border_control": "passport",
-    "entrance": "door-open",
-    "harbor": "anchor",
-
-    # SPORT & RECREATION - Ball-Sportarten
-    "pitch": "futbol",
-    "stadium": "building",
-    "sports_centre": "dumbbell",
-    "athletics": "person-running",
-    "football": "futbol",
-    "soccer": "futbol",
-    "basketball": "basketball",
-    "volleyball": "volleyball",
-    "beachvolleyball": "volleyball",
-    "tennis": "table-tennis-paddle-ball",
-    "table_tennis": "table-tennis-paddle-ball",
-    "handball": "hand",
-    "team_handball": "hand",
-    "baseball": "baseball",
-    "field_hockey": "hockey-puck",
-    "hockey": "hockey-puck",
-    "rugby_union": "football",
-    "badminton": "shuttle-space",
-
-    # SPORT - Wasser
-    "swimming": "person-swimming",
-    "swimming_pool": "person-swimming",
-    "water_park": "water",
-    "scuba_diving": "water",
-    "water_ski": "person-skiing-nordic",
-    "sailing": "sailboat",
-    "rowing": "water",
-    "canoe": "water",
-    "surfing": "water",
-    "diving": "water",
-
-    # SPORT - Winter
-    "winter_sports": "snowflake",
-    "ice_hockey": "hockey-puck",
-    "ice_rink": "snowflake",
-    "ice_stock": "snowflake",
-    "curling": "snowflake",
-    "skiing": "person-skiing",
-    "skating": "snowflake",
-    "toboggan": "sleigh",
-
-    # SPORT - Andere
-    "golf": "golf-ball-tee",
-    "disc_golf": "compact-disc",
-    "cycling": "bicycle",
-    "bicycle": "bicycle",
-    "running": "person-running",
-    "climbing": "mountain",
-    "climbing_adventure": "mountain",
-    "archery": "bullseye",
-    "shooting": "bullseye",
-    "shooting_range": "bullseye",
-    "gymnastics": "person-walking",
-    "yoga": "spa",
-    "judo": "hand-fist",
-    "boxing": "hand-fist",
-    "wrestling": "hand-fist",
-    "equestrian": "horse",
-    "horse_racing": "horse",
-    "dog_racing": "dog",
-    "motor": "car",
-    "motocross": "motorcycle",
-    "rc_car": "car",
-    "karting": "car",
-    "skateboard": "person-skateboarding",
-    "bmx": "bicycle",
-    "paragliding": "plane",
-    "free_flying": "plane",
-    "model_aerodrome": "plane",
-    "orienteering": "compass",
-    "paintball": "bullseye",
-    "billiards": "circle",
-    "table_soccer": "futbol",
-    "chess": "chess",
-    "bowls": "bowling-ball",
-    "boules": "circle",
-    "horseshoes": "horse",
-    "racquet": "table-tennis-paddle-ball",
-    "paddle_tennis": "table-tennis-paddle-ball",
-    "long_jump": "person-running",
-
-    # NATUR & PARKS
-    "park": "tree",
-    "garden": "leaf",
-    "playground": "child",
-    "picnic_site": "utensils",
-    "dog_park": "dog",
-    "campsite": "campground",
-    "basin": "water",
-    "reservoir": "water",
-
-    # UTILITIES & SERVICES
-    "atm": "money-bill",
-    "toilets": "restroom",
-    "drinking_water": "faucet-drip",
-    "fountain": "fountain",
-    "waste_basket": "trash-can",
-    "recycling": "recycle",
-    "information": "circle-info",
-    "shelter": "house",
-    "bench": "chair",
-    "telephone": "phone",
-    "car": "car",
-    "multi": "circle",
+    poi_type: icon
+    for mappings in CATEGORY_MAPPINGS.values()
+    for poi_type, icon in mappings.items()
 }
 
+
 # Alle POI-Typen aus der Referenz
 ALL_POI_TYPES = [
     "lodging", "restaurant", "cafe", "bar", "beer", "biergarten", "fast_food",
@@ -220,3 +242,48 @@ ALL_POI_TYPES = [
     "fountain", "waste_basket", "recycling", "information", "shelter", "bench",
     "telephone", "car", "multi",
 ]
+
+# Alternative Schreibweisen / OSM-Tag-Werte -> POI-Typ
+ALIASES = {
+    "theater": "theatre",
+    "harbour": "harbor",
+    "community_center": "community_centre",
+    "sports_center": "sports_centre",
+    "camp_site": "campsite",
+    "post_office": "post",
+    "doctor": "doctors",
+    "toilet": "toilets",
+    "fuel_station": "fuel",
+    "townhall": "town_hall",
+    "swimming_area": "swimming",
+    "veterinarian": "veterinary",
+}
+
+# Fallback-Ketten: fehlt das Icon eines POI-Typs, wird das des nächsten verwendet
+FALLBACKS = {
+    "bicycle_parking": "parking",
+    "motorcycle_parking": "parking",
+    "biergarten": "beer",
+    "pub": "beer",
+    "beer": "bar",
+    "grocery": "shop",
+    "bakery": "shop",
+    "butcher": "shop",
+    "alcohol_shop": "shop",
+    "clothing_store": "shop",
+    "beachvolleyball": "volleyball",
+    "team_handball": "handball",
+    "field_hockey": "hockey",
+    "ice_hockey": "hockey",
+    "table_tennis": "tennis",
+    "paddle_tennis": "tennis",
+    "table_soccer": "soccer",
+    "soccer": "football",
+    "swimming_pool": "swimming",
+    "shooting_range": "shooting",
+    "climbing_adventure": "climbing",
+    "disc_golf": "golf",
+    "horse_racing": "equestrian",
+    "dog_park": "park",
+    "garden": "park",
+}
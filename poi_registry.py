@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""POI-Registry: Typen, Kategorien, Aliase und Fallback-Ketten.
+
+Baut aus den Daten in ``poi_mapping.py`` eine Registry mit geordnetem
+Tupel und Frozenset aller POI-Typen (Duplikate entfernt) und einer
+Lookup-Tabelle Name → (POI-Typ, Kategorie, Fallback-Kette), über die
+Alias-Auflösung und Abdeckungsprüfungen in O(1) laufen.
+
+Die Lookup-Tabelle kann mit ``python poi_registry.py --compile`` als
+``poi_registry.json`` vorberechnet werden; beim Import wird sie
+verwendet, solange der gespeicherte Hash zu den Quelldaten passt.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from build_manifest import hash_json
+from poi_mapping import ALIASES, ALL_POI_TYPES, CATEGORY_MAPPINGS, FALLBACKS
+
+TABLE_FILE = Path(__file__).with_name("poi_registry.json")
+TABLE_VERSION = 1
+
+
+class RegistryError(Exception):
+    """Ungültige Registry-Daten"""
+
+
+def source_data():
+    return {
+        "types": list(ALL_POI_TYPES),
+        "categories": {category: list(mappings) for category, mappings in CATEGORY_MAPPINGS.items()},
+        "aliases": ALIASES,
+        "fallbacks": FALLBACKS,
+    }
+
+
+class POIRegistry:
+    def __init__(self, types, categories, aliases=None, fallbacks=None, lookup=None):
+        """``types`` in Referenz-Reihenfolge, ``categories`` Kategorie → POI-Typen"""
+        self.types = tuple(dict.fromkeys(types))
+        self.type_set = frozenset(self.types)
+        self.duplicates = len(types) - len(self.types)
+        self.categories = {category: tuple(members) for category, members in categories.items()}
+        self.aliases = dict(aliases or {})
+        self.fallbacks = dict(fallbacks or {})
+        self.lookup = lookup if lookup is not None else self._compile()
+
+    def _compile(self):
+        category_of = {}
+        for category, members in self.categories.items():
+            for poi_type in members:
+                category_of.setdefault(poi_type, category)
+
+        lookup = {}
+        for poi_type in self.types:
+            lookup[poi_type] = {
+                "type": poi_type,
+                "category": category_of.get(poi_type),
+                "chain": self._chain(poi_type),
+            }
+        for alias, target in self.aliases.items():
+            if target in lookup and alias not in lookup:
+                lookup[alias] = lookup[target]
+        return lookup
+
+    def _chain(self, poi_type):
+        chain = [poi_type]
+        while chain[-1] in self.fallbacks:
+            following = self.fallbacks[chain[-1]]
+            if following in chain:
+                break  # Zyklus, validate() meldet ihn
+            chain.append(following)
+        return tuple(chain)
+
+    def __contains__(self, name):
+        return name in self.lookup
+
+    def __iter__(self):
+        return iter(self.types)
+
+    def __len__(self):
+        return len(self.types)
+
+    def canonical(self, name):
+        """POI-Typ zu einem Namen oder Alias (None falls unbekannt)"""
+        entry = self.lookup.get(name)
+        return entry["type"] if entry else None
+
+    def category(self, name):
+        entry = self.lookup.get(name)
+        return entry["category"] if entry else None
+
+    def fallback_chain(self, name):
+        """POI-Typ gefolgt von seinen Fallbacks, z.B. (pub, beer, bar)"""
+        entry = self.lookup.get(name)
+        return tuple(entry["chain"]) if entry else ()
+
+    def resolve_icon(self, name, mapping):
+        """Icon des ersten gemappten Typs in der Fallback-Kette"""
+        for poi_type in self.fallback_chain(name) or (name,):
+            icon = mapping.get(poi_type)
+            if icon:
+                return icon
+        return None
+
+    def members(self, category):
+        return self.categories.get(category, ())
+
+    def coverage(self, mapping):
+        """(gemappte, fehlende) POI-Typen in Referenz-Reihenfolge"""
+        mapped = [poi_type for poi_type in self.types if poi_type in mapping]
+        missing = [poi_type for poi_type in self.types if poi_type not in mapping]
+        return mapped, missing
+
+    def validate(self):
+        """Liste der gefundenen Probleme (leer wenn alles konsistent ist)"""
+        problems = []
+        if self.duplicates:
+            problems.append(f"{self.duplicates} doppelte POI-Typen in der Referenzliste")
+        seen = {}
+        for category, members in self.categories.items():
+            for poi_type in members:
+                if poi_type not in self.type_set:
+                    problems.append(f"{poi_type} ({category}) fehlt in der Referenzliste")
+                if poi_type in seen:
+                    problems.append(f"{poi_type} in {seen[poi_type]} und {category}")
+                seen.setdefault(poi_type, category)
+        for poi_type in self.types:
+            if poi_type not in seen:
+                problems.append(f"{poi_type} ohne Kategorie")
+        for alias, target in self.aliases.items():
+            if alias in self.type_set:
+                problems.append(f"Alias {alias} ist selbst ein POI-Typ")
+            if target not in self.type_set:
+                problems.append(f"Alias {alias} → unbekannter Typ {target}")
+        for poi_type, following in self.fallbacks.items():
+            if poi_type not in self.type_set or following not in self.type_set:
+                problems.append(f"Fallback {poi_type} → {following} mit unbekanntem Typ")
+            elif self._chain(poi_type)[-1] in self.fallbacks:
+                problems.append(f"Zyklische Fallback-Kette ab {poi_type}")
+        return problems
+
+    def to_table(self, source_hash):
+        return {
+            "version": TABLE_VERSION,
+            "source": source_hash,
+            "types": list(self.types),
+            "categories": {category: list(members) for category, members in self.categories.items()},
+            "aliases": self.aliases,
+            "fallbacks": self.fallbacks,
+            "lookup": self.lookup,
+        }
+
+    @classmethod
+    def from_source(cls, data):
+        return cls(data["types"], data["categories"], data["aliases"], data["fallbacks"])
+
+    @classmethod
+    def from_table(cls, table):
+        return cls(table["types"], table["categories"], table["aliases"], table["fallbacks"],
+                   lookup=table["lookup"])
+
+
+def load_registry(table_file=TABLE_FILE):
+    """Registry aus der vorberechneten Tabelle, falls aktuell, sonst aus den Quelldaten"""
+    data = source_data()
+    source_hash = hash_json(data)
+    try:
+        with open(table_file, 'r') as f:
+            table = json.load(f)
+        if table.get("version") == TABLE_VERSION and table.get("source") == source_hash:
+            return POIRegistry.from_table(table)
+    except (OSError, ValueError, KeyError):
+        pass
+    return POIRegistry.from_source(data)
+
+
+def compile_table(table_file=TABLE_FILE):
+    """Validiere die Quelldaten und schreibe die Lookup-Tabelle"""
+    data = source_data()
+    registry = POIRegistry.from_source(data)
+    problems = registry.validate()
+    if problems:
+        raise RegistryError("; ".join(problems))
+    table_file = Path(table_file)
+    tmp = table_file.with_name(f".{table_file.name}.tmp")
+    tmp.write_text(json.dumps(registry.to_table(hash_json(data)), indent=1, ensure_ascii=False))
+    tmp.replace(table_file)
+    return registry
+
+
+REGISTRY = load_registry()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate or precompile the POI registry.")
+    parser.add_argument("--compile", nargs="?", const=str(TABLE_FILE), metavar="PATH",
+                        help="Lookup-Tabelle schreiben (Standard: poi_registry.json)")
+    args = parser.parse_args()
+
+    if args.compile:
+        try:
+            registry = compile_table(args.compile)
+        except RegistryError as e:
+            print(f"Registry ungültig: {e}")
+            sys.exit(1)
+        print(f"{len(registry)} POI-Typen, {len(registry.lookup)} Namen → {args.compile}")
+    else:
+        problems = REGISTRY.validate()
+        for problem in problems:
+            print(problem)
+        print(f"{len(REGISTRY)} POI-Typen, {len(REGISTRY.categories)} Kategorien, "
+              f"{len(REGISTRY.aliases)} Aliase, {len(REGISTRY.fallbacks)} Fallbacks")
+        sys.exit(1 if problems else 0)
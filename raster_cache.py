@@ -0,0 +1,89 @@
+"""Persistenter Cache gerasterter Icons für das native Backend.
+
+Jede Bitmap liegt als PNG unter ``<cache_dir>/<xx>/<schlüssel>.png``; der
+Schlüssel ist ein Hash über SVG-Inhalt, Pixel-Ratio und Render-Optionen
+(SDF, Versionen der Render-Bibliotheken). Treffer setzen die mtime neu,
+``evict()`` löscht die am längsten unbenutzten Einträge, bis der Cache
+wieder unter dem Byte-Budget liegt. Einträge werden atomar geschrieben,
+sodass mehrere Builds und Sprite-Sets denselben Cache nutzen können.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class RasterCache:
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, svg_hash, ratio, options):
+        payload = json.dumps({"svg": svg_hash, "ratio": f"{ratio:g}", "options": options}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return self.cache_dir / key[:2] / f"{key}.png"
+
+    def get(self, svg_hash, ratio, options):
+        """PNG-Bytes oder None; ein Treffer zählt als Nutzung für die Verdrängung"""
+        path = self.path(self.key(svg_hash, ratio, options))
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            data = None
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def put(self, svg_hash, ratio, options, data):
+        path = self.path(self.key(svg_hash, ratio, options))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def entries(self):
+        """(mtime, Größe, Pfad) aller Einträge"""
+        found = []
+        if not self.cache_dir.exists():
+            return found
+        for directory in os.scandir(self.cache_dir):
+            if not directory.is_dir():
+                continue
+            for entry in os.scandir(directory.path):
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # gleichzeitig verdrängt
+                found.append((stat.st_mtime, stat.st_size, entry.path))
+        return found
+
+    def evict(self):
+        """Lösche die ältesten Einträge bis zum Budget, liefert (gelöscht, Bytes danach)"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed, total
@@ -0,0 +1,132 @@
+"""Atomares Veröffentlichen des Output-Verzeichnisses.
+
+Builds schreiben in ein Staging-Verzeichnis unter ``tmp/``. Fertige
+Stände werden nach ``.<output>-releases/<id>`` verschoben und das
+Output-Verzeichnis als Symlink per ``rename`` umgeschaltet, sodass ein
+Tile-Server nie halb geschriebene Dateien sieht. Die letzten N Releases
+bleiben für ein sofortiges Rollback erhalten.
+"""
+
+import os
+import shutil
+import time
+from pathlib import Path
+
+# Migriertes Verzeichnis vor dem ersten atomaren Publish: sortiert vor
+# allen Zeitstempel-IDs, damit ein Rollback dorthin möglich bleibt
+LEGACY_RELEASE_ID = "00000000-000000-initial"
+
+
+def releases_dir(output_dir):
+    output_dir = Path(output_dir)
+    return output_dir.with_name(f".{output_dir.name}-releases")
+
+
+def new_release_id():
+    """Sortierbare ID: Zeitstempel (ns-genau) + PID"""
+    now = time.time_ns()
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now // 10**9))
+    return f"{stamp}-{now % 10**9:09d}-{os.getpid()}"
+
+
+def create_staging_dir(tmp_dir):
+    staging = Path(tmp_dir) / f"release-{new_release_id()}"
+    staging.mkdir(parents=True)
+    return staging
+
+
+def current_release(output_dir):
+    """Pfad des aktiven Releases (None wenn output_dir kein Symlink ist)"""
+    output_dir = Path(output_dir)
+    if not output_dir.is_symlink():
+        return None
+    return (output_dir.parent / os.readlink(output_dir)).resolve()
+
+
+def list_releases(output_dir):
+    """Alle Releases, älteste zuerst"""
+    directory = releases_dir(output_dir)
+    if not directory.exists():
+        return []
+    return sorted((p for p in directory.iterdir() if p.is_dir()), key=lambda p: p.name)
+
+
+def seed_staging(staging, output_dir, names):
+    """Übernimm ausgewählte Dateien des aktiven Stands per Hardlink.
+
+    Nur für Dateien gedacht, die danach nie in-place überschrieben werden.
+    """
+    output_dir = Path(output_dir)
+    seeded = 0
+    for name in names:
+        src = output_dir / name
+        if not src.is_file():
+            continue
+        try:
+            os.link(src, Path(staging) / name)
+        except OSError:
+            shutil.copy2(src, Path(staging) / name)
+        seeded += 1
+    return seeded
+
+
+def switch_to(output_dir, release):
+    """Lasse output_dir atomar auf release zeigen"""
+    output_dir = Path(output_dir)
+
+    if output_dir.exists() and not output_dir.is_symlink():
+        # Einmalige Migration eines echten Verzeichnisses
+        if any(output_dir.iterdir()):
+            legacy = releases_dir(output_dir) / LEGACY_RELEASE_ID
+            if legacy.exists():
+                legacy = legacy.with_name(f"{LEGACY_RELEASE_ID}-{new_release_id()}")
+            os.rename(output_dir, legacy)
+        else:
+            output_dir.rmdir()
+
+    # Relativer Link, funktioniert auch wenn das Elternverzeichnis gemountet wird
+    target = os.path.relpath(release, output_dir.parent)
+    tmp_link = output_dir.with_name(f".{output_dir.name}.tmp-link")
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    os.symlink(target, tmp_link)
+    os.replace(tmp_link, output_dir)
+
+
+def prune_releases(output_dir, keep):
+    """Behalte die neuesten ``keep`` Releases (und immer das aktive)"""
+    active = current_release(output_dir)
+    releases = list_releases(output_dir)
+    removed = 0
+    for release in releases[:-keep] if keep > 0 else releases:
+        if active is not None and release.resolve() == active:
+            continue
+        shutil.rmtree(release)
+        removed += 1
+    return removed
+
+
+def publish(staging, output_dir, keep=3):
+    """Verschiebe staging in die Releases und schalte output_dir um"""
+    directory = releases_dir(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    release = directory / Path(staging).name.replace("release-", "", 1)
+    # rename auf demselben Dateisystem, sonst Kopie (vor dem Umschalten)
+    shutil.move(str(staging), str(release))
+    switch_to(output_dir, release)
+    prune_releases(output_dir, keep)
+    return release
+
+
+def rollback(output_dir, steps=1):
+    """Schalte auf das Release ``steps`` Schritte vor dem aktiven zurück"""
+    releases = list_releases(output_dir)
+    active = current_release(output_dir)
+    positions = [r.resolve() for r in releases]
+    if active not in positions:
+        return None
+    index = positions.index(active) - steps
+    if index < 0:
+        return None
+    switch_to(output_dir, releases[index])
+    return releases[index]
@@ -0,0 +1,64 @@
+"""Langlebiger spreet-Container ("warm worker").
+
+Statt für jede Sprite-Variante ``docker run --rm`` mit frischen Mounts zu
+starten, läuft ein Container im Hintergrund und bekommt die Jobs per
+``docker exec``. Der Container-Name leitet sich aus Image und Mounts ab,
+sodass auch spätere Läufe einen noch laufenden Worker wiederverwenden.
+"""
+
+import hashlib
+import subprocess
+from pathlib import Path, PurePosixPath
+
+SPREET_PATH = "/app/spreet"
+
+
+class SpreetWorkerError(Exception):
+    """Worker-Container konnte nicht gestartet werden"""
+
+
+class SpreetWorker:
+    def __init__(self, image, mounts):
+        """``mounts`` ist ein Dict Host-Pfad → Container-Pfad"""
+        self.image = image
+        self.mounts = {Path(host).absolute(): container for host, container in mounts.items()}
+        key = "|".join([image] + [f"{h}:{c}" for h, c in sorted(self.mounts.items())])
+        self.name = f"poi-spreet-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:12]}"
+
+    def is_running(self):
+        result = subprocess.run(
+            ['docker', 'inspect', '--format', '{{.State.Running}}', self.name],
+            capture_output=True, text=True
+        )
+        return result.returncode == 0 and result.stdout.strip() == "true"
+
+    def start(self):
+        """Starte den Worker (oder verwende einen laufenden wieder)"""
+        if self.is_running():
+            return False
+        # Reste eines gestoppten Containers gleichen Namens entfernen
+        subprocess.run(['docker', 'rm', '-f', self.name], capture_output=True)
+        cmd = ['docker', 'run', '-d', '--rm', '--name', self.name, '--entrypoint', 'sleep']
+        for host, container in sorted(self.mounts.items()):
+            cmd.extend(['-v', f"{host}:{container}"])
+        cmd.extend([self.image, 'infinity'])
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise SpreetWorkerError(result.stderr.strip())
+        return True
+
+    def stop(self):
+        subprocess.run(['docker', 'rm', '-f', self.name], capture_output=True)
+
+    def container_path(self, host_path):
+        """Übersetze einen Host-Pfad in den Container"""
+        host_path = Path(host_path).absolute()
+        for host, container in self.mounts.items():
+            if host_path == host or host in host_path.parents:
+                return str(PurePosixPath(container) / host_path.relative_to(host).as_posix())
+        raise ValueError(f"{host_path} liegt in keinem Worker-Mount")
+
+    def exec(self, args):
+        """Führe spreet im Worker aus"""
+        return subprocess.run(['docker', 'exec', self.name, SPREET_PATH] + list(args),
+                              capture_output=True, text=True)
@@ -0,0 +1,438 @@
+"""Nativer Sprite-Packer - Alternative zu Docker-spreet.
+
+Rastert die SVGs im Prozess (optional über ``cairosvg`` + ``Pillow``),
+packt die Bitmaps per Rechteck-Bin-Packing in ein Sheet und schreibt
+``<name>.png``/``<name>.json`` im selben Format wie spreet.
+"""
+
+import hashlib
+import io
+import json
+import math
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import sprite_sdf
+
+try:
+    import cairosvg
+    import cairosvg.parser
+    import cairosvg.surface
+except (ImportError, OSError):  # optional; OSError: Paket installiert, libcairo fehlt
+    cairosvg = None
+
+try:
+    from PIL import Image
+except ImportError:  # optional
+    Image = None
+
+
+def missing_dependencies(sdf=False):
+    """Liste fehlender Python-Pakete für das native Backend"""
+    missing = []
+    if cairosvg is None:
+        missing.append("cairosvg")
+    if Image is None:
+        missing.append("Pillow")
+    if sdf and sprite_sdf.np is None:
+        missing.append("numpy")
+    return missing
+
+
+def backend_fingerprint():
+    """Versionen der Render-Bibliotheken (für das Build-Manifest)"""
+    return {
+        "cairosvg": getattr(cairosvg, "__version__", None),
+        "pillow": getattr(Image, "__version__", None) if Image else None,
+        "numpy": getattr(sprite_sdf.np, "__version__", None),
+    }
+
+
+def render_svg(svg_path, pixel_ratios, sdf=False):
+    """Parse ein SVG einmal und rendere es in allen Pixel-Ratios.
+
+    Mit ``sdf`` wird jede Bitmap direkt im Worker in ein Signed Distance
+    Field umgerechnet. Liefert ein Dict Ratio → PNG-Bytes (picklebar für
+    den Prozess-Pool).
+    """
+    tree = cairosvg.parser.Tree(bytestring=Path(svg_path).read_bytes())
+    rendered = {}
+    for ratio in pixel_ratios:
+        output = io.BytesIO()
+        cairosvg.surface.PNGSurface(tree, output, 96, scale=ratio).finish()
+        if sdf:
+            image = Image.open(io.BytesIO(output.getvalue())).convert("RGBA")
+            output = io.BytesIO()
+            sprite_sdf.to_sdf(image, ratio).save(output, format="PNG")
+        rendered[ratio] = output.getvalue()
+    return rendered
+
+
+def _render_job(job):
+    name, svg_path, pixel_ratios, sdf = job
+    return name, render_svg(svg_path, pixel_ratios, sdf)
+
+
+def render_all(svg_paths, pixel_ratios, workers=None, executor=None, sdf=False, cache=None):
+    """Rendere alle SVGs parallel.
+
+    ``svg_paths`` ist ein Dict Name → Pfad. Ein übergebener ``executor``
+    (z.B. ein zwischen mehreren Sprite-Sets geteilter Pool) ersetzt den
+    eigenen Prozess-Pool. Mit ``cache`` (``RasterCache``) werden nur
+    Bitmaps gerendert, die dort noch fehlen. Liefert
+    ``{Ratio: {Name: RGBA-Bild}}``.
+    """
+    workers = workers or os.cpu_count() or 1
+    options = {"sdf": sdf, **backend_fingerprint()}
+
+    cached = {}
+    svg_hashes = {}
+    jobs = []
+    for name, path in sorted(svg_paths.items()):
+        missing = tuple(pixel_ratios)
+        if cache is not None:
+            svg_hashes[name] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+            for ratio in pixel_ratios:
+                png_data = cache.get(svg_hashes[name], ratio, options)
+                if png_data is not None:
+                    cached.setdefault(name, {})[ratio] = png_data
+            missing = tuple(ratio for ratio in pixel_ratios if ratio not in cached.get(name, {}))
+        if missing:
+            jobs.append((name, str(path), missing, sdf))
+
+    if executor is not None and jobs:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+    elif workers == 1 or len(jobs) < 2:
+        results = [_render_job(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as executor:
+            results = list(executor.map(_render_job, jobs, chunksize=chunksize))
+
+    if cache is not None:
+        for name, rendered in results:
+            for ratio, png_data in rendered.items():
+                cache.put(svg_hashes[name], ratio, options, png_data)
+
+    images = {ratio: {} for ratio in pixel_ratios}
+    for name, rendered in list(cached.items()) + results:
+        for ratio, png_data in rendered.items():
+            images[ratio][name] = Image.open(io.BytesIO(png_data)).convert("RGBA")
+    return images
+
+
+def _sheet_width(sizes):
+    """Ausgangsbreite: Quadrat gleicher Fläche, mindestens das breiteste Icon"""
+    total_area = sum(w * h for w, h in sizes.values())
+    max_width = max(w for w, _ in sizes.values())
+    return max(max_width, math.ceil(math.sqrt(total_area)))
+
+
+def _used_extent(sizes, positions):
+    width = max(positions[name][0] + sizes[name][0] for name in positions)
+    height = max(positions[name][1] + sizes[name][1] for name in positions)
+    return width, height
+
+
+def pack_shelf(sizes, sheet_width=None):
+    """Einfaches Shelf-Packing.
+
+    ``sizes`` ist ein Dict Name → (Breite, Höhe). Liefert
+    ``(sheet_breite, sheet_höhe, {Name: (x, y)})``.
+    """
+    if not sizes:
+        return 0, 0, {}
+
+    sheet_width = max(sheet_width or _sheet_width(sizes), max(w for w, _ in sizes.values()))
+
+    # Höchste Icons zuerst, Name als stabiler Tie-Breaker
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+
+    positions = {}
+    x = y = shelf_height = used_width = 0
+    for name in order:
+        w, h = sizes[name]
+        if x + w > sheet_width:
+            y += shelf_height
+            x = shelf_height = 0
+        positions[name] = (x, y)
+        x += w
+        used_width = max(used_width, x)
+        shelf_height = max(shelf_height, h)
+
+    return used_width, y + shelf_height, positions
+
+
+def pack_skyline(sizes, sheet_width=None):
+    """Skyline-Packing (Bottom-Left): jedes Icon auf die niedrigste Stelle der Kontur"""
+    if not sizes:
+        return 0, 0, {}
+
+    sheet_width = max(sheet_width or _sheet_width(sizes), max(w for w, _ in sizes.values()))
+    order = sorted(sizes, key=lambda name: (-sizes[name][1], -sizes[name][0], name))
+
+    # Kontur als Liste von Segmenten [x, y, breite], lückenlos von 0 bis sheet_width
+    skyline = [[0, 0, sheet_width]]
+    positions = {}
+    for name in order:
+        w, h = sizes[name]
+        best = None
+        for i, (x, _, _) in enumerate(skyline):
+            if x + w > sheet_width:
+                break
+            # Höchstes Segment unter der Breite w ab Segment i
+            y = 0
+            remaining = w
+            for seg_x, seg_y, seg_w in skyline[i:]:
+                y = max(y, seg_y)
+                remaining -= seg_w
+                if remaining <= 0:
+                    break
+            if best is None or (y + h, x) < (best[1] + h, best[0]):
+                best = (x, y)
+        x, y = best
+        positions[name] = (x, y)
+
+        # Kontur aktualisieren: [x, x+w) liegt jetzt auf Höhe y+h
+        updated = []
+        for seg_x, seg_y, seg_w in skyline:
+            seg_end = seg_x + seg_w
+            if seg_end <= x or seg_x >= x + w:
+                updated.append([seg_x, seg_y, seg_w])
+                continue
+            if seg_x < x:
+                updated.append([seg_x, seg_y, x - seg_x])
+            if seg_end > x + w:
+                updated.append([x + w, seg_y, seg_end - x - w])
+        updated.append([x, y + h, w])
+        updated.sort()
+        skyline = []
+        for segment in updated:
+            if skyline and skyline[-1][1] == segment[1]:
+                skyline[-1][2] += segment[2]
+            else:
+                skyline.append(segment)
+
+    width, height = _used_extent(sizes, positions)
+    return width, height, positions
+
+
+def pack_maxrects(sizes, sheet_width=None):
+    """MaxRects-Packing (Best Short Side Fit) ohne Rotation"""
+    if not sizes:
+        return 0, 0, {}
+
+    sheet_width = max(sheet_width or _sheet_width(sizes), max(w for w, _ in sizes.values()))
+    sheet_height = sum(h for _, h in sizes.values())
+    order = sorted(sizes, key=lambda name: (-sizes[name][0] * sizes[name][1], name))
+    # Freie Rechtecke, in die kein Icon passt, werden gar nicht erst geführt
+    min_w = min(w for w, _ in sizes.values())
+    min_h = min(h for _, h in sizes.values())
+
+    free = [(0, 0, sheet_width, sheet_height)]
+    positions = {}
+    for name in order:
+        w, h = sizes[name]
+        best = None
+        for fx, fy, fw, fh in free:
+            if w <= fw and h <= fh:
+                # Niedrige Position zuerst, damit das Sheet flach bleibt
+                score = (fy + h, min(fw - w, fh - h), fx)
+                if best is None or score < best[0]:
+                    best = (score, fx, fy)
+        _, x, y = best
+        positions[name] = (x, y)
+
+        # Vom Icon getroffene freie Rechtecke aufteilen
+        kept = []
+        split = set()
+        for fx, fy, fw, fh in free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                kept.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                split.add((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                split.add((x + w, fy, fx + fw - x - w, fh))
+            if y > fy:
+                split.add((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                split.add((fx, y + h, fw, fy + fh - y - h))
+
+        # Nur die neuen Teile können in anderen enthalten sein
+        free = kept
+        for rect in sorted(split, key=lambda r: -r[2] * r[3]):
+            rx, ry, rw, rh = rect
+            if rw < min_w or rh < min_h:
+                continue
+            if not any(rx >= ox and ry >= oy and rx + rw <= ox + ow and ry + rh <= oy + oh
+                       for ox, oy, ow, oh in free):
+                free.append(rect)
+
+    width, height = _used_extent(sizes, positions)
+    return width, height, positions
+
+
+PACKERS = {
+    "shelf": pack_shelf,
+    "skyline": pack_skyline,
+    "maxrects": pack_maxrects,
+}
+
+# Breitenfaktoren relativ zum flächengleichen Quadrat, die je Packer probiert werden
+WIDTH_FACTORS = (1.0, 1.15, 1.3, 1.5)
+
+# MaxRects wächst quadratisch mit der Icon-Anzahl; darüber nimmt ``auto``
+# nur Shelf und Skyline (explizit gewählt läuft MaxRects immer)
+MAXRECTS_AUTO_LIMIT = 1000
+
+
+def pack(sizes, packer="auto"):
+    """Packe mit einem oder (``auto``) allen Packern und mehreren Sheet-Breiten.
+
+    Liefert ``(packer_name, breite, höhe, positionen)`` des Ergebnisses mit
+    der kleinsten Sheet-Fläche. ``auto`` lässt MaxRects ab
+    ``MAXRECTS_AUTO_LIMIT`` Icons aus.
+    """
+    if not sizes:
+        return packer, 0, 0, {}
+    names = list(PACKERS) if packer == "auto" else [packer]
+    if packer == "auto" and len(sizes) > MAXRECTS_AUTO_LIMIT:
+        names.remove("maxrects")
+    base_width = _sheet_width(sizes)
+
+    best = None
+    for name in names:
+        for factor in WIDTH_FACTORS:
+            width, height, positions = PACKERS[name](sizes, math.ceil(base_width * factor))
+            if best is None or width * height < best[1] * best[2]:
+                best = (name, width, height, positions)
+    return best
+
+
+def fill_ratio(sizes, width, height):
+    """Anteil der Sheet-Fläche, der von Icons belegt ist"""
+    if not width or not height:
+        return 0.0
+    return sum(w * h for w, h in sizes.values()) / (width * height)
+
+
+def group_duplicates(svg_paths):
+    """Gruppiere inhaltsgleiche SVGs.
+
+    Liefert ein Dict kanonischer Name → alle Namen mit identischem Inhalt
+    (der alphabetisch erste Name ist kanonisch).
+    """
+    by_hash = {}
+    for name in sorted(svg_paths):
+        digest = hashlib.sha256(Path(svg_paths[name]).read_bytes()).hexdigest()
+        by_hash.setdefault(digest, []).append(name)
+    return {names[0]: names for names in by_hash.values()}
+
+
+def sprite_index(images, positions, pixel_ratio, aliases=None, sdf=False):
+    """Index-JSON im spreet-Format.
+
+    ``aliases`` (kanonischer Name → Namen) erzeugt mehrere Einträge, die
+    auf dasselbe Rechteck zeigen. ``sdf`` markiert alle Einträge als
+    Signed Distance Field.
+    """
+    index = {}
+    for canonical in images:
+        x, y = positions[canonical]
+        width, height = images[canonical].size
+        for name in (aliases or {}).get(canonical, [canonical]):
+            index[name] = {
+                "height": height,
+                "pixelRatio": pixel_ratio,
+                "width": width,
+                "x": x,
+                "y": y,
+            }
+            if sdf:
+                index[name]["sdf"] = True
+    return dict(sorted(index.items()))
+
+
+def compose_sheet(images, positions, width, height):
+    sheet = Image.new("RGBA", (max(width, 1), max(height, 1)), (0, 0, 0, 0))
+    for name, image in images.items():
+        sheet.paste(image, positions[name])
+    return sheet
+
+
+def ratio_suffix(pixel_ratio):
+    """Dateinamen-Suffix: '' für 1x, sonst '@<n>x'"""
+    return "" if pixel_ratio == 1 else f"@{pixel_ratio:g}x"
+
+
+def sheet_stats(output_base):
+    """Größe und Füllgrad eines fertigen Sheets (auch für spreet-Ausgaben).
+
+    Liest das Index-JSON (Aliase zählen einmal) und die PNG-Größe aus dem
+    IHDR-Chunk.
+    """
+    output_base = Path(output_base)
+    with open(output_base.parent / f"{output_base.name}.json", 'r') as f:
+        index = json.load(f)
+    with open(output_base.parent / f"{output_base.name}.png", 'rb') as f:
+        width, height = struct.unpack(">II", f.read(24)[16:24])
+    rects = {(e["x"], e["y"], e["width"], e["height"]) for e in index.values()}
+    sizes = {rect: rect[2:] for rect in rects}
+    return {
+        "width": width,
+        "height": height,
+        "icons": len(rects),
+        "fill": round(fill_ratio(sizes, width, height), 4),
+    }
+
+
+def write_sprite(images, output_base, pixel_ratio, aliases=None, sdf=False, packer="auto"):
+    """Packe die Bilder einer Ratio und schreibe PNG + Index-JSON.
+
+    Liefert den Namen des verwendeten Packers.
+    """
+    output_base = Path(output_base)
+    sizes = {name: image.size for name, image in images.items()}
+    packer, width, height, positions = pack(sizes, packer)
+
+    sheet = compose_sheet(images, positions, width, height)
+    sheet.save(output_base.parent / f"{output_base.name}.png", format="PNG")
+
+    with open(output_base.parent / f"{output_base.name}.json", 'w') as f:
+        json.dump(sprite_index(images, positions, pixel_ratio, aliases, sdf), f, indent=2)
+    return packer
+
+
+def build_sprites(svg_dir, output_dir, sprite_name, pixel_ratios=(1, 2), workers=None,
+                  unique=True, executor=None, sdf=False, packer="auto", cache=None):
+    """Erstelle ``<sprite_name><suffix>.png/.json`` für alle Pixel-Ratios.
+
+    Jedes SVG wird genau einmal geparst; gerendert wird in einem
+    Prozess-Pool mit ``workers`` Prozessen (Standard: alle Kerne). Mit
+    ``unique`` werden inhaltsgleiche SVGs nur einmal gepackt, mit ``sdf``
+    entsteht ein einfärbbares SDF-Sprite. ``packer`` wählt das
+    Bin-Packing (``auto``: kleinste Fläche aller Verfahren), ``cache``
+    einen ``RasterCache`` für bereits gerasterte Icons. Liefert
+    ``(Anzahl gepackter Icons, {Variante: Packer})``.
+    """
+    missing = missing_dependencies(sdf)
+    if missing:
+        raise RuntimeError(f"Natives Backend benötigt: {', '.join(missing)}")
+
+    svg_paths = {svg.stem: svg for svg in Path(svg_dir).glob("*.svg")}
+    aliases = group_duplicates(svg_paths) if unique else None
+    if aliases:
+        svg_paths = {name: svg_paths[name] for name in aliases}
+    images = render_all(svg_paths, pixel_ratios, workers, executor, sdf, cache)
+
+    packers = {}
+    for ratio in pixel_ratios:
+        output_base = Path(output_dir) / f"{sprite_name}{ratio_suffix(ratio)}"
+        packers[output_base.name] = write_sprite(images[ratio], output_base, ratio, aliases, sdf,
+                                                 packer)
+
+    return len(svg_paths), packers
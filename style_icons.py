@@ -0,0 +1,184 @@
+"""Ermittlung der von einem MapLibre-Style erreichbaren Icons.
+
+Wertet ``icon-image`` aller Symbol-Layer statisch aus: Literale,
+``{token}``-Vorlagen, Legacy-Funktionen (``stops``) und die Ausdrücke
+``get``, ``concat``, ``match``, ``case``, ``coalesce``, ``step``,
+``image``, ``literal`` und ``to-string``. Werte von ``["get", prop]``
+werden, wo möglich, über die Literale im Layer-Filter eingeschränkt
+(``==``, ``in``, ``match`` innerhalb von ``all``/``any``). Jede mögliche
+Ausgabe wird als regulärer Ausdruck dargestellt, der gegen die
+vorhandenen Icon-Namen geprüft wird; nicht auswertbare Teile passen auf
+alles, sodass nie ein benötigtes Icon fehlt.
+"""
+
+import json
+import re
+
+ANY = ".*"
+
+_TOKEN = re.compile(r"\{([^}]+)\}")
+
+
+def _literal(value):
+    return re.escape(str(value))
+
+
+def _alternatives(patterns):
+    patterns = sorted(set(patterns))
+    if not patterns:
+        return set()
+    if ANY in patterns:
+        return {ANY}
+    return set(patterns)
+
+
+def filter_constraints(expression):
+    """Eigenschaft → erlaubte Werte, die ein Filter erzwingt"""
+    if not isinstance(expression, list) or not expression:
+        return {}
+    op = expression[0]
+    args = expression[1:]
+
+    def prop(arg):
+        # Legacy-Filter nutzen den Namen direkt, Ausdrücke ["get", name]
+        if isinstance(arg, str):
+            return arg
+        if isinstance(arg, list) and len(arg) == 2 and arg[0] == "get" and isinstance(arg[1], str):
+            return arg[1]
+        return None
+
+    def values(items):
+        if len(items) == 1 and isinstance(items[0], list) and items[0][:1] == ["literal"]:
+            items = items[0][1]
+        if all(isinstance(item, (str, int, float)) for item in items):
+            return {str(item) for item in items}
+        return None
+
+    if op == "==" and len(args) == 2:
+        name = prop(args[0])
+        found = values([args[1]])
+        return {name: found} if name and found else {}
+    if op == "in" and len(args) >= 2:
+        name = prop(args[0])
+        found = values(args[1:])
+        return {name: found} if name and found else {}
+    if op == "match" and len(args) >= 4:
+        # ["match", ["get", p], [werte], true, false]
+        name = prop(args[0])
+        allowed = set()
+        for labels, output in zip(args[1:-1:2], args[2:-1:2]):
+            if output is True:
+                labels = labels if isinstance(labels, list) else [labels]
+                allowed |= {str(label) for label in labels}
+        if name and allowed and args[-1] is False:
+            return {name: allowed}
+        return {}
+    if op == "all":
+        merged = {}
+        for sub in args:
+            for name, found in filter_constraints(sub).items():
+                merged[name] = merged[name] & found if name in merged else found
+        return merged
+    if op == "any" and args:
+        branches = [filter_constraints(sub) for sub in args]
+        common = set(branches[0]).intersection(*branches[1:])
+        return {name: set().union(*(branch[name] for branch in branches)) for name in common}
+    return {}
+
+
+def _template(text, constraints):
+    """'{class}_icon' → Muster; Tokens ohne Einschränkung passen auf alles"""
+    parts = _TOKEN.split(text)
+    patterns = [""]
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            options = [_literal(part)]
+        elif part in constraints:
+            options = [_literal(value) for value in sorted(constraints[part])]
+        else:
+            options = [ANY]
+        patterns = [prefix + option for prefix in patterns for option in options]
+    return set(patterns)
+
+
+def expression_patterns(value, constraints):
+    """Menge von Mustern für alle möglichen Ausgaben eines icon-image-Werts"""
+    if isinstance(value, str):
+        return _template(value, constraints)
+    if isinstance(value, (int, float)):
+        return {_literal(value)}
+    if isinstance(value, dict):
+        # Legacy-Funktion mit stops (Zoom oder Property)
+        outputs = [stop[1] for stop in value.get("stops", []) if len(stop) == 2]
+        if "default" in value:
+            outputs.append(value["default"])
+        return _alternatives(set().union(*(expression_patterns(o, constraints) for o in outputs)))
+    if not isinstance(value, list) or not value:
+        return {ANY}
+
+    op, args = value[0], value[1:]
+    if op == "literal" and args:
+        return expression_patterns(args[0], {}) if isinstance(args[0], str) else {ANY}
+    if op in ("image", "to-string") and args:
+        return expression_patterns(args[0], constraints)
+    if op == "get" and len(args) == 1 and isinstance(args[0], str):
+        if args[0] in constraints:
+            return {_literal(v) for v in constraints[args[0]]}
+        return {ANY}
+    if op == "concat":
+        patterns = {""}
+        for arg in args:
+            options = expression_patterns(arg, constraints)
+            patterns = {prefix + option for prefix in patterns for option in options}
+            if len(patterns) > 10000:
+                return {ANY}
+        return _alternatives(patterns)
+    if op == "match" and len(args) >= 3:
+        outputs = list(args[2:-1:2]) + [args[-1]]
+    elif op == "case" and len(args) >= 1:
+        outputs = list(args[1:-1:2]) + [args[-1]]
+    elif op == "step" and len(args) >= 2:
+        outputs = [args[1]] + list(args[3::2])
+    elif op == "coalesce":
+        outputs = list(args)
+    else:
+        return {ANY}
+    return _alternatives(set().union(*(expression_patterns(o, constraints) for o in outputs)))
+
+
+def style_layers(style):
+    return [layer for layer in style.get("layers", [])
+            if layer.get("type") == "symbol" and "icon-image" in layer.get("layout", {})]
+
+
+def reachable_icons(style, candidates):
+    """Icons aus ``candidates``, die ein Layer des Styles anzeigen kann.
+
+    Liefert ``(erreichbar, referenziert_aber_fehlend)``; letzteres enthält
+    nur wörtlich bekannte Namen (z.B. aus Literalen oder Filterwerten).
+    """
+    candidates = set(candidates)
+    reachable = set()
+    missing = set()
+    for layer in style_layers(style):
+        constraints = filter_constraints(layer.get("filter"))
+        patterns = expression_patterns(layer["layout"]["icon-image"], constraints)
+        for pattern in patterns:
+            if pattern == ANY:
+                reachable |= candidates
+                continue
+            regex = re.compile(pattern)
+            matched = {name for name in candidates if regex.fullmatch(name)}
+            reachable |= matched
+            if not matched and re.escape(_unescape(pattern)) == pattern:
+                missing.add(_unescape(pattern))
+    return reachable, missing
+
+
+def _unescape(pattern):
+    return re.sub(r"\\(.)", r"\1", pattern)
+
+
+def load_style(path):
+    with open(path, 'r') as f:
+        return json.load(f)
@@ -0,0 +1,141 @@
+"""Normalisierung der Quell-SVGs vor dem Packen.
+
+Font-Awesome-SVGs haben unterschiedlich breite viewBoxen (z.B. 320-640
+Einheiten bei 512 Höhe) und keinen Rand. Die Normalisierung legt jedes
+Icon zentriert auf eine quadratische Fläche fester Pixelgröße mit
+einstellbarem Rand (Platz für Halos), entfernt Kommentare und
+Metadaten-Elemente und kürzt die Pfaddaten. Ergebnisse werden unter dem
+Hash von Quelle und Optionen zwischengespeichert.
+"""
+
+import hashlib
+import os
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+SVG_NS = "http://www.w3.org/2000/svg"
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", "http://www.w3.org/1999/xlink")
+
+# Elemente ohne Einfluss auf das Rendering
+STRIP_TAGS = {"metadata", "title", "desc"}
+
+_PATH_TOKEN = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def format_number(value, precision=2):
+    """Kürzeste Darstellung: 12.50 → 12.5, 0.5 → .5, -0.0 → 0"""
+    text = f"{round(value, precision):.{precision}f}".rstrip("0").rstrip(".")
+    if text in ("", "-0"):
+        return "0"
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
+
+
+def minify_path(d, precision=2):
+    """Runde Koordinaten und entferne überflüssige Trennzeichen"""
+    out = []
+    previous = ""
+    for token in _PATH_TOKEN.findall(d):
+        if token.isalpha():
+            out.append(token)
+            previous = token
+            continue
+        number = format_number(float(token), precision)
+        # Trenner nur zwischen zwei Zahlen, bei Vorzeichen oder ".5" nach "1.5" nicht nötig
+        if previous and not previous.isalpha() and not (
+                number.startswith("-") or (number.startswith(".") and "." in previous)):
+            out.append(" ")
+        out.append(number)
+        previous = number
+    return "".join(out)
+
+
+def parse_viewbox(root):
+    """(min_x, min_y, Breite, Höhe) aus viewBox bzw. width/height"""
+    viewbox = root.get("viewBox")
+    if viewbox:
+        values = [float(v) for v in re.split(r"[\s,]+", viewbox.strip())]
+        if len(values) == 4:
+            return tuple(values)
+    width = float(re.sub(r"[^\d.]", "", root.get("width", "0")) or 0)
+    height = float(re.sub(r"[^\d.]", "", root.get("height", "0")) or 0)
+    if not width or not height:
+        raise ValueError("SVG ohne viewBox und Größe")
+    return 0.0, 0.0, width, height
+
+
+def _strip(element):
+    for child in list(element):
+        if _local(child.tag) in STRIP_TAGS:
+            element.remove(child)
+            continue
+        _strip(child)
+    if element.text is not None:
+        element.text = element.text.strip() or None
+    element.tail = None
+
+
+def normalize_svg(data, size=24, padding=2, precision=2):
+    """Normalisiere ein SVG (Bytes) auf ``size``×``size`` px mit ``padding`` px Rand"""
+    root = ET.fromstring(data)  # Kommentare verwirft der Parser
+    min_x, min_y, width, height = parse_viewbox(root)
+
+    inner = size - 2 * padding
+    if inner <= 0:
+        raise ValueError(f"Rand {padding} zu groß für Icon-Größe {size}")
+    units_per_px = max(width, height) / inner
+    side = size * units_per_px
+    min_x -= (side - width) / 2
+    min_y -= (side - height) / 2
+
+    _strip(root)
+    root.set("viewBox", " ".join(format_number(v, precision) for v in (min_x, min_y, side, side)))
+    root.set("width", str(size))
+    root.set("height", str(size))
+    for element in root.iter():
+        if _local(element.tag) == "path" and element.get("d"):
+            element.set("d", minify_path(element.get("d"), precision))
+
+    return ET.tostring(root, encoding="unicode").encode("utf-8")
+
+
+class NormalizeCache:
+    """Normalisierte SVGs unter ``<cache_dir>/<hash>.svg``"""
+
+    def __init__(self, cache_dir, size=24, padding=2, precision=2):
+        self.cache_dir = Path(cache_dir)
+        self.options = {"size": size, "padding": padding, "precision": precision}
+
+    def key(self, data):
+        digest = hashlib.sha256(data)
+        digest.update(repr(sorted(self.options.items())).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, data):
+        """Pfad des normalisierten SVGs, wird bei Bedarf erzeugt"""
+        path = self.cache_dir / f"{self.key(data)}.svg"
+        if not path.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(normalize_svg(data, **self.options))
+            os.replace(tmp, path)
+        return path
+
+    def prune(self, keep):
+        """Entferne Einträge, die nicht in ``keep`` (Pfade) stehen"""
+        keep = {Path(path).name for path in keep}
+        removed = 0
+        for entry in self.cache_dir.glob("*.svg"):
+            if entry.name not in keep:
+                entry.unlink()
+                removed += 1
+        return removed
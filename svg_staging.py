@@ -0,0 +1,124 @@
+"""Staging der Quell-SVGs ins Build-Verzeichnis.
+
+Statt jede Datei zu kopieren, werden Links angelegt (Reflink, Hardlink
+oder Symlink, mit Kopie als Fallback). Einträge, die bereits auf den
+richtigen Inhalt zeigen, bleiben unangetastet.
+"""
+
+import errno
+import filecmp
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl FICLONE (linux/fs.h): Copy-on-Write Klon auf btrfs/XFS
+FICLONE = 0x40049409
+
+# "auto" versucht Reflink, dann Hardlink, dann Kopie
+STAGING_MODES = ("auto", "reflink", "hardlink", "symlink", "copy")
+
+
+def reflink(src, dest):
+    """Copy-on-Write Klon, wirft OSError wenn nicht unterstützt"""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflink nicht unterstützt")
+    with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+        try:
+            fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+        except OSError:
+            dest_file.close()
+            os.unlink(dest)
+            raise
+
+
+def is_current(src, dest, mode):
+    """True wenn dest bereits den Inhalt von src liefert"""
+    if not os.path.lexists(dest):
+        return False
+    if mode == "symlink":
+        return os.path.islink(dest) and os.readlink(dest) == str(src)
+    if os.path.islink(dest):
+        return False
+    try:
+        if os.path.samefile(src, dest):
+            return True
+    except OSError:
+        return False
+    return filecmp.cmp(src, dest, shallow=False)
+
+
+def _place(src, tmp, mode):
+    """Lege tmp als Link/Kopie von src an, liefert den verwendeten Modus"""
+    if mode == "symlink":
+        os.symlink(src, tmp)
+        return "symlink"
+    if mode in ("auto", "reflink"):
+        try:
+            reflink(src, tmp)
+            return "reflink"
+        except OSError:
+            if mode == "reflink":
+                raise
+    if mode in ("auto", "hardlink"):
+        try:
+            os.link(src, tmp)
+            return "hardlink"
+        except OSError:
+            if mode == "hardlink":
+                raise
+    shutil.copy2(src, tmp)
+    return "copy"
+
+
+def stage_file(src, dest, mode="auto"):
+    """Stage src nach dest.
+
+    Liefert den verwendeten Modus oder None, wenn dest schon aktuell war.
+    Das Ersetzen erfolgt atomar über eine temporäre Datei.
+    """
+    src = Path(src).absolute()
+    dest = Path(dest)
+    if is_current(src, dest, mode):
+        return None
+
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    if os.path.lexists(tmp):
+        os.unlink(tmp)
+    used = _place(src, tmp, mode)
+    os.replace(tmp, dest)
+    return used
+
+
+def stage_bytes(data, dest):
+    """Schreibe data nach dest, falls sich der Inhalt unterscheidet.
+
+    Liefert "write" oder None, wenn dest schon aktuell war.
+    """
+    dest = Path(dest)
+    if dest.is_file() and not dest.is_symlink():
+        if dest.stat().st_size == len(data) and dest.read_bytes() == data:
+            return None
+
+    tmp = dest.with_name(f".{dest.name}.tmp")
+    if os.path.lexists(tmp):
+        os.unlink(tmp)
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, dest)
+    return "write"
+
+
+def remove_stale(directory, names):
+    """Entferne ``<name>.svg`` für alle übergebenen Namen, liefert die Anzahl"""
+    removed = 0
+    for name in names:
+        path = Path(directory) / f"{name}.svg"
+        if os.path.lexists(path):
+            path.unlink()
+            removed += 1
+    return removed